@@ -0,0 +1,354 @@
+# bot/async_worker.py
+import asyncio
+import time
+from typing import Dict, Optional
+
+import aiohttp
+
+from bot.config import (
+    SPRING_ORDER_URL,
+    SECRET_TOKEN,
+    ORDER_INTERVAL,
+    CONCURRENCY,
+    HTTP_TIMEOUT,
+    COINS,
+    REPORT_INTERVAL
+)
+from bot.order import create_order
+from bot.load_profile import LoadProfile
+from bot.price_stream import start_price_feed
+from bot.worker import print_summary, OrderSource
+from bot.metrics import recorder, MetricsReporter
+from bot.pacing import Pacer
+from bot.lifecycle import Lifecycle
+
+
+HEADERS = {
+    "X-Internal-Token": SECRET_TOKEN,
+    "Content-Type": "application/json"
+}
+
+
+class ScheduleLag:
+    """오픈 루프 스케줄 대비 실제 발사 시각이 얼마나 밀렸는지 집계"""
+
+    LATE_THRESHOLD = 0.005  # 5ms 이상 밀리면 '지연 발사'
+
+    def __init__(self):
+        self.scheduled = 0
+        self.sent = 0
+        self.dropped = 0
+        self.late = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+    def merge(self, data: Dict):
+        """다른 프로세스의 to_dict() 결과 합산"""
+        self.scheduled += data["scheduled"]
+        self.sent += data["sent"]
+        self.dropped += data["dropped"]
+        self.late += data["late"]
+        self.total_lag += data["total_lag"]
+        self.max_lag = max(self.max_lag, data["max_lag"])
+        self.last_lag = max(self.last_lag, data["last_lag"])
+
+    def record(self, lag: float):
+        self.sent += 1
+        self.total_lag += lag
+        self.last_lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if lag > self.LATE_THRESHOLD:
+            self.late += 1
+
+    def report(self, elapsed: float):
+        avg_lag = self.total_lag / self.sent if self.sent else 0.0
+
+        print("\n------ 오픈 루프 스케줄 ------")
+        print(f"예정 주문 수 : {self.scheduled}")
+        print(f"발사        : {self.sent} ({self.sent / elapsed if elapsed else 0.0:.2f} TPS)")
+        print(f"드롭        : {self.dropped} (in-flight 상한 초과 / 페이싱 / 시세 없음)")
+        print(f"지연 발사    : {self.late} (>{self.LATE_THRESHOLD * 1000:.0f}ms)")
+        print(f"평균 지연    : {avg_lag * 1000:.2f}ms")
+        print(f"최대 지연    : {self.max_lag * 1000:.2f}ms")
+        print(f"종료 시 지연 : {self.last_lag * 1000:.2f}ms")
+
+
+def make_session(concurrency: int) -> aiohttp.ClientSession:
+    """
+    keep-alive 커넥션 풀을 공유하는 세션
+    - 커넥션 수 = 동시 요청 수 → 주문마다 TCP/TLS 핸드셰이크를 다시 하지 않음
+    """
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        limit_per_host=concurrency,
+        keepalive_timeout=30,
+        ttl_dns_cache=300
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=HEADERS,
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    )
+
+
+async def send_order_async(
+    session: aiohttp.ClientSession,
+    order: dict,
+    started: Optional[float] = None,
+    pacer: Optional[Pacer] = None
+) -> bool:
+    """
+    :param started: 지연시간 측정 기준 (time.monotonic)
+                    오픈 루프에서는 '예정 발사 시각'을 넘겨서
+                    스케줄 밀림까지 지연시간에 포함 (coordinated omission 방지)
+    :param pacer: 응답 코드 / 지연시간을 알려 송신 속도·동시 요청 한도 조절
+    """
+    if started is None:
+        started = time.monotonic()
+
+    try:
+        async with session.post(SPRING_ORDER_URL, json=order) as res:
+            # 바디를 끝까지 읽어야 커넥션이 풀로 반환됨
+            body = await res.read()
+            ok = res.status == 200
+            latency = time.monotonic() - started
+            recorder.record(order["_coin"], order["orderType"], latency, ok, str(res.status), started)
+            if pacer is not None:
+                pacer.on_response(str(res.status), latency, res.headers.get("Retry-After"))
+
+            if ok:
+                if recorder.should_sample():
+                    recorder.log(
+                        f"✅ [BOT] {order['_coin']} "
+                        f"{order['orderType']} "
+                        f"{order['orderCount']} @ {order['orderPrice']}"
+                    )
+                return True
+
+            recorder.log_failure(str(res.status), body[:200].decode(errors="replace"))
+
+    except Exception as e:
+        latency = time.monotonic() - started
+        recorder.record(order["_coin"], order["orderType"], latency, False, "error", started)
+        recorder.log_failure("error", f"💥 요청 예외: {e!r}")
+        if pacer is not None:
+            pacer.on_response("error", latency)
+
+    return False
+
+
+async def warm_prices(coins):
+    """
+    create_order()의 시세 조회는 동기(requests) 호출이라
+    이벤트 루프를 막지 않도록 시세 공급(REST 갱신 스레드 또는 WS 스트림)을 executor 에서 시작
+    → 이후 주문 경로에서는 항상 캐시(stale 포함) hit
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, start_price_feed, coins)
+
+
+async def order_worker(
+    session: aiohttp.ClientSession,
+    stop: asyncio.Event,
+    order_source: OrderSource = create_order,
+    index: int = 0,
+    pacer: Optional[Pacer] = None
+):
+    while not stop.is_set():
+        if pacer is not None:
+            # 동시 요청 한도 밖의 워커는 쉼 (한도가 다시 늘면 합류)
+            if not pacer.allows(index):
+                await asyncio.sleep(pacer.IDLE_SLEEP)
+                continue
+            await pacer.wait_async()
+
+        order = order_source()
+
+        if order is None:
+            await asyncio.sleep(0.1)
+            continue
+
+        await send_order_async(session, order, pacer=pacer)
+
+        if ORDER_INTERVAL > 0:
+            await asyncio.sleep(ORDER_INTERVAL)
+
+
+async def run_engine(
+    concurrency: int = CONCURRENCY,
+    duration: Optional[float] = None,
+    order_source: OrderSource = create_order,
+    pacer: Optional[Pacer] = None,
+    lifecycle: Optional[Lifecycle] = None
+):
+    """
+    :param duration: 측정 시간(초)
+    :param lifecycle: 있으면 워밍업 후 측정, 종료 시 drain_timeout 까지만 응답 대기
+    """
+    stop = asyncio.Event()
+
+    print(f"🔥 시세 캐시 워밍업 ({len(COINS)}개 코인)")
+    await warm_prices(COINS)
+
+    async with make_session(concurrency) as session:
+        tasks = [
+            asyncio.create_task(order_worker(session, stop, order_source, i, pacer), name=f"BOT-{i}")
+            for i in range(concurrency)
+        ]
+
+        try:
+            if lifecycle is not None:
+                await lifecycle.run_async(duration)
+            elif duration is None:
+                await asyncio.Event().wait()
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            stop.set()
+            if lifecycle is not None:
+                await lifecycle.drain(tasks)
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_open_loop(
+    profile: LoadProfile,
+    duration: float,
+    concurrency: int = CONCURRENCY,
+    max_inflight: Optional[int] = None,
+    order_source: OrderSource = create_order,
+    lag: Optional[ScheduleLag] = None,
+    pacer: Optional[Pacer] = None,
+    lifecycle: Optional[Lifecycle] = None
+) -> ScheduleLag:
+    """
+    오픈 루프 엔진
+    - 응답을 기다리지 않고 profile 스케줄 시각마다 주문을 발사
+    - 백엔드가 느려져도 제공 부하(offered load)가 줄지 않음
+    - in-flight 요청이 max_inflight 를 넘으면 해당 주문은 드롭으로 집계
+    - lag 을 넘기면 중간에 취소돼도 그때까지의 집계가 남음
+    - pacer 가 있으면 토큰이 없거나 in-flight 가 적응형 한도 이상일 때도 드롭
+    - lifecycle 이 있으면 스케줄 앞 warmup 초는 집계에서 빼고 (스케줄은 warmup + duration),
+      종료 시 drain_timeout 까지만 응답을 기다림
+    - 길이가 정해진 프로파일(시나리오)은 그 길이를 넘겨 돌리지 않음 → 워밍업은 시나리오 앞부분에 포함
+    """
+    lag = lag if lag is not None else ScheduleLag()
+    max_inflight = max_inflight or concurrency * 10
+    inflight = set()
+    warmup = lifecycle.warmup if lifecycle is not None else 0.0
+    span = warmup + duration
+
+    limit = getattr(profile, "duration", None)
+    if limit is not None and span > limit:
+        span = limit
+        if warmup >= span:
+            print(f"⚠️ 워밍업({warmup:.0f}초)이 시나리오({span:.0f}초)보다 길어 워밍업 없이 측정합니다")
+            warmup = 0.0
+            lifecycle.warmup = 0.0
+        duration = span - warmup
+        print(f"⏱️ 시나리오 길이 {span:.0f}초에 맞춤 (워밍업 {warmup:.0f}초 + 측정 {duration:.0f}초)")
+
+    print(f"🔥 시세 캐시 워밍업 ({len(COINS)}개 코인)")
+    await warm_prices(COINS)
+
+    async with make_session(concurrency) as session:
+        started = time.monotonic()
+        if lifecycle is not None:
+            lifecycle.plan(started, duration)
+
+        try:
+            for i, offset in enumerate(profile.arrivals(span)):
+                due = started + offset
+                # 워밍업 구간 주문은 보내기만 하고 스케줄 통계에서 제외 (recorder 측정 구간과 같은 기준)
+                measuring = due >= started + warmup
+                if measuring:
+                    lag.scheduled += 1
+                delay = due - time.monotonic()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif i % 100 == 0:
+                    # 스케줄이 밀린 상태에서도 응답 처리가 굶지 않도록 양보
+                    await asyncio.sleep(0)
+
+                if len(inflight) >= max_inflight or (pacer is not None and not pacer.admit(len(inflight))):
+                    lag.dropped += measuring
+                    continue
+
+                order = order_source()
+                if order is None:
+                    lag.dropped += measuring
+                    continue
+
+                task = asyncio.create_task(send_order_async(session, order, due, pacer))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+
+                if measuring:
+                    lag.record(time.monotonic() - due)
+        finally:
+            if lifecycle is not None:
+                lifecycle.end_measure(min(time.monotonic(), started + span))
+                await lifecycle.drain(list(inflight))
+            await asyncio.gather(*inflight, return_exceptions=True)
+
+    return lag
+
+
+def start_open_loop(
+    profile: LoadProfile,
+    duration: float,
+    concurrency: int = CONCURRENCY,
+    order_source: OrderSource = create_order,
+    pacer: Optional[Pacer] = None,
+    lifecycle: Optional[Lifecycle] = None
+):
+    print(f"\n🚀 BOT 오픈 루프 부하 시작: {profile.describe()}, {duration:.0f}초")
+    lifecycle = lifecycle or Lifecycle()
+    lag = ScheduleLag()
+
+    reporter = MetricsReporter(recorder, REPORT_INTERVAL)
+    reporter.start()
+
+    try:
+        asyncio.run(run_open_loop(
+            profile, duration, concurrency,
+            order_source=order_source, lag=lag, pacer=pacer, lifecycle=lifecycle
+        ))
+    except KeyboardInterrupt:
+        print("\n🛑 종료 신호 감지")
+
+    reporter.stop()
+    elapsed = lifecycle.elapsed
+    print_summary(elapsed)
+    lag.report(elapsed)
+    if pacer is not None:
+        print(f"페이싱      : {pacer.summary()}")
+
+
+def start_async(
+    concurrency: int = CONCURRENCY,
+    duration: Optional[float] = None,
+    order_source: OrderSource = create_order,
+    pacer: Optional[Pacer] = None,
+    lifecycle: Optional[Lifecycle] = None
+):
+    print(f"\n🚀 BOT 주문 시뮬레이션 시작 (asyncio, 동시 요청 {concurrency}개)")
+    lifecycle = lifecycle or Lifecycle()
+
+    reporter = MetricsReporter(recorder, REPORT_INTERVAL)
+    reporter.start()
+
+    try:
+        asyncio.run(run_engine(concurrency, duration, order_source, pacer, lifecycle))
+    except KeyboardInterrupt:
+        print("\n🛑 종료 신호 감지")
+
+    reporter.stop()
+    print_summary(lifecycle.elapsed)
+    if pacer is not None:
+        print(f"페이싱    : {pacer.summary()}")
@@ -0,0 +1,387 @@
+# bot/benchmark.py
+"""
+봇 자체 처리 한계 측정 (Spring 서버 / 업비트 / DB 없이 로컬 목 서버 상대로)
+
+    python -m bot.benchmark --duration 10
+    python -m bot.benchmark --engines open --latency-ms 20 --slo-p99-ms 100
+    python -m bot.benchmark --baseline reports/benchmark_20250101_120000.json
+
+1. bot.mock_server 를 별도 프로세스로 실행 (봇과 GIL 을 나눠 쓰지 않도록)
+2. thread / async 엔진: 주문 간격 0 으로 돌려 closed-loop 최대 처리량 측정
+3. open 엔진: 목표 TPS 를 2배씩 올리다 SLO 를 깨면 이분 탐색
+   → 처리량 95% 이상 달성 + p99 ≤ SLO + 실패율/드롭률 허용치 이내인 최대 TPS
+4. 결과 표 출력 + REPORT_DIR/benchmark_<시각>.json 저장
+   --baseline 을 주면 이전 결과보다 tolerance 이상 느려졌을 때 exit 1
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import socket
+import time
+from datetime import datetime
+from threading import Thread
+from typing import Dict, List, Optional
+
+from bot.mock_server import DEFAULT_MARKETS, serve
+
+ENGINES = ("thread", "async", "open")
+
+# 최대 지속 가능 TPS 판정 기준 (run_bot.py --mode knee 와 공통)
+DEFAULT_SLO_P99_MS = 100.0
+MAX_FAIL_RATIO = 0.01
+MAX_DROP_RATIO = 0.01
+
+
+def configure_env(args):
+    """bot.config 를 import 하기 전에 목 서버를 바라보도록 환경변수 덮어쓰기"""
+    base = f"http://{args.host}:{args.port}"
+    os.environ.update({
+        "SPRING_ORDER_URL": f"{base}/api/orders",
+        "UPBIT_API_URL": base,
+        "BOT_PRICE_SOURCE": "rest",
+        "BOT_CATEGORY_MAP": ",".join(f"{coin}:{i + 1}" for i, coin in enumerate(args.markets)),
+        "BOT_THREADS": str(args.threads),
+        "ORDER_INTERVAL": "0",
+        "BOT_REPORT_INTERVAL": str(args.report_interval),
+    })
+
+
+def start_mock_servers(args) -> List[mp.Process]:
+    ctx = mp.get_context("spawn")
+    servers = [
+        ctx.Process(
+            target=serve,
+            kwargs={
+                "host": args.host,
+                "port": args.port,
+                "markets": args.markets,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "throttle_rate": args.throttle_rate,
+                "reuse_port": args.mock_workers > 1,
+            },
+            name=f"MOCK-{i}",
+            daemon=True
+        )
+        for i in range(args.mock_workers)
+    ]
+    for p in servers:
+        p.start()
+
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection((args.host, args.port), timeout=0.5).close()
+            return servers
+        except OSError:
+            time.sleep(0.1)
+
+    for p in servers:
+        p.terminate()
+    raise RuntimeError(f"목 서버가 {args.host}:{args.port} 에서 뜨지 않았습니다")
+
+
+def _result(engine: str, elapsed: float, **extra) -> Dict:
+    from bot.metrics import recorder
+
+    recorder.drain()
+    total = recorder.success + recorder.fail
+    return {
+        "engine": engine,
+        "elapsed_s": round(elapsed, 3),
+        "success": recorder.success,
+        "fail": recorder.fail,
+        "status": dict(recorder.status),
+        "tps": round(total / elapsed, 2) if elapsed else 0.0,
+        "ok_tps": round(recorder.success / elapsed, 2) if elapsed else 0.0,
+        **recorder.total.summary(),
+        **extra
+    }
+
+
+def bench_thread(threads: int, duration: float, order_source, lifecycle) -> Dict:
+    from bot import worker
+
+    worker.stop_event.clear()
+
+    pool = [
+        Thread(target=worker.bot_worker, args=(order_source,), name=f"BOT-{i}", daemon=True)
+        for i in range(threads)
+    ]
+    for t in pool:
+        t.start()
+
+    lifecycle.run_blocking(duration)
+    worker.stop_event.set()
+    lifecycle.join(pool)
+
+    return _result("thread", lifecycle.elapsed, workers=threads)
+
+
+def bench_async(concurrency: int, duration: float, order_source, lifecycle) -> Dict:
+    from bot.async_worker import run_engine
+
+    asyncio.run(run_engine(concurrency, duration, order_source, lifecycle=lifecycle))
+    return _result("async", lifecycle.elapsed, workers=concurrency)
+
+
+def bench_open(rate: float, duration: float, concurrency: int, order_source, lifecycle) -> Dict:
+    from bot.async_worker import run_open_loop
+    from bot.load_profile import ConstantProfile
+
+    lag = asyncio.run(run_open_loop(
+        ConstantProfile(rate), duration, concurrency, order_source=order_source, lifecycle=lifecycle
+    ))
+    return _result(
+        "open", lifecycle.elapsed,
+        workers=concurrency,
+        target_tps=rate,
+        scheduled=lag.scheduled,
+        dropped=lag.dropped,
+        late=lag.late,
+        max_lag_ms=round(lag.max_lag * 1000, 3)
+    )
+
+
+def check_slo(result: Dict, slo_p99_ms: float, max_fail_ratio: float = MAX_FAIL_RATIO) -> List[str]:
+    """SLO 를 깬 항목 목록 (비어 있으면 통과)"""
+    broken = []
+    total = result["success"] + result["fail"]
+
+    if result["tps"] < result["target_tps"] * 0.95:
+        broken.append("throughput")
+    if result["p99_ms"] > slo_p99_ms:
+        broken.append("p99")
+    if total and result["fail"] / total > max_fail_ratio:
+        broken.append("fail")
+    if result["scheduled"] and result["dropped"] / result["scheduled"] > MAX_DROP_RATIO:
+        broken.append("drop")
+    return broken
+
+
+def make_lifecycle(args):
+    from bot.lifecycle import Lifecycle
+    return Lifecycle(warmup=args.warmup, drain_timeout=args.drain_timeout)
+
+
+def find_max_tps(
+    start_rate: float,
+    max_rate: float,
+    duration: float,
+    concurrency: int,
+    order_source,
+    slo_p99_ms: float = DEFAULT_SLO_P99_MS,
+    max_fail_ratio: float = MAX_FAIL_RATIO,
+    refine: int = 3,
+    warmup: float = 2.0,
+    drain_timeout: float = 5.0
+) -> Dict:
+    """
+    목표 TPS 를 2배씩 올리다 SLO 가 깨지면 통과/실패 구간을 refine 번 이분 탐색
+    (벤치마크 open 엔진과 run_bot.py --mode knee 가 같은 기준으로 이 함수를 씀)
+    - 단계마다 Lifecycle 로 워밍업 / 드레인을 빼고 측정 구간 기준 TPS 를 계산
+    """
+    from bot.lifecycle import Lifecycle
+
+    runs = []
+
+    def attempt(rate: float) -> bool:
+        print(f"\n🎯 open 엔진 목표 {rate:.0f} TPS ({duration:.0f}초)")
+        lifecycle = Lifecycle(warmup=warmup, drain_timeout=drain_timeout)
+        result = bench_open(rate, duration, concurrency, order_source, lifecycle)
+        result["slo_broken"] = check_slo(result, slo_p99_ms, max_fail_ratio)
+        runs.append(result)
+        return not result["slo_broken"]
+
+    passed, failed = 0.0, None
+    rate = start_rate
+    while rate <= max_rate:
+        if not attempt(rate):
+            failed = rate
+            break
+        passed = rate
+        rate *= 2
+
+    if failed is not None:
+        for _ in range(refine):
+            mid = (passed + failed) / 2
+            if failed - mid < start_rate / 4:
+                break
+            if attempt(mid):
+                passed = mid
+            else:
+                failed = mid
+
+    return {"max_sustainable_tps": passed, "runs": runs}
+
+
+def print_table(runs: List[Dict]):
+    print("\n========== 벤치마크 결과 (지연시간 ms) ==========")
+    print(
+        f"{'engine':<7} {'target':>8} {'TPS':>9} {'ok%':>6} "
+        f"{'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8}  SLO"
+    )
+    for r in runs:
+        total = r["success"] + r["fail"]
+        ok_pct = r["success"] / total * 100 if total else 0.0
+        target = f"{r['target_tps']:.0f}" if "target_tps" in r else "-"
+        slo = "" if "slo_broken" not in r else ("✅" if not r["slo_broken"] else "❌ " + ",".join(r["slo_broken"]))
+        print(
+            f"{r['engine']:<7} {target:>8} {r['tps']:>9.1f} {ok_pct:>5.1f}% "
+            f"{r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['p99.9_ms']:>8.1f} {r['max_ms']:>8.1f}  {slo}"
+        )
+
+
+def compare_baseline(report: Dict, path: str, tolerance: float) -> bool:
+    """이전 결과 대비 처리량이 tolerance 이상 떨어졌으면 False"""
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    def headline(data: Dict) -> Dict[str, float]:
+        values = {r["engine"]: r["tps"] for r in data["runs"] if r["engine"] != "open"}
+        if data.get("max_sustainable_tps") is not None:
+            values["open"] = data["max_sustainable_tps"]
+        return values
+
+    before, after = headline(baseline), headline(report)
+    ok = True
+
+    print(f"\n------ 기준선 비교 ({path}) ------")
+    for engine, old in before.items():
+        new = after.get(engine)
+        if new is None or not old:
+            continue
+        change = (new - old) / old
+        regressed = change < -tolerance
+        ok = ok and not regressed
+        print(f"{'❌' if regressed else '✅'} {engine:<7} {old:>9.1f} → {new:>9.1f} TPS ({change:+.1%})")
+    return ok
+
+
+def write_report(report: Dict, directory: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="로컬 목 서버 상대 봇 처리량 벤치마크")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="thread,async,open 중 선택 (콤마 구분)")
+    parser.add_argument("--duration", type=float, default=10.0, help="엔진(또는 open 단계)별 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 워밍업(초, 집계 제외)")
+    parser.add_argument("--drain-timeout", type=float, default=5.0, help="종료 시 in-flight 응답 대기 상한(초)")
+    parser.add_argument("--threads", type=int, default=50, help="thread 엔진 워커 수")
+    parser.add_argument("--concurrency", type=int, default=200, help="async/open 엔진 동시 요청 수")
+    parser.add_argument("--pregen", action="store_true", help="주문을 OrderStream 으로 미리 생성")
+
+    # open 엔진 최대 TPS 탐색
+    parser.add_argument("--start-rate", type=float, default=250.0)
+    parser.add_argument("--max-rate", type=float, default=50_000.0)
+    parser.add_argument("--refine", type=int, default=3, help="이분 탐색 횟수")
+    parser.add_argument("--slo-p99-ms", type=float, default=DEFAULT_SLO_P99_MS)
+
+    # 목 서버
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--markets", default=",".join(DEFAULT_MARKETS))
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--mock-workers", type=int, default=2, help="목 서버 프로세스 수 (SO_REUSEPORT)")
+
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--baseline", default=None, help="비교할 이전 benchmark_*.json")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="허용 처리량 하락 비율")
+
+    args = parser.parse_args()
+    args.markets = [m.strip().upper() for m in args.markets.split(",") if m.strip()]
+    args.engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    for engine in args.engines:
+        if engine not in ENGINES:
+            parser.error(f"알 수 없는 엔진: {engine}")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    configure_env(args)
+
+    print(f"▶️ 목 서버 {args.mock_workers}개 가동: {args.host}:{args.port} "
+          f"(지연 {args.latency_ms}ms + 지터 {args.jitter_ms}ms, 에러 {args.error_rate:.1%})")
+    servers = start_mock_servers(args)
+
+    try:
+        # 환경변수를 덮어쓴 뒤에 import 해야 목 서버 주소 / 카테고리가 반영됨
+        from bot.config import COINS, REPORT_DIR, REPORT_INTERVAL
+        from bot.metrics import recorder, MetricsReporter
+        from bot.order import create_order
+        from bot.price_stream import start_price_feed
+
+        start_price_feed(COINS)
+        order_source = create_order
+        if args.pregen:
+            from bot.order_stream import OrderStream
+            order_source = OrderStream().start()
+
+        reporter = MetricsReporter(recorder, REPORT_INTERVAL)
+        reporter.start()
+
+        runs: List[Dict] = []
+        max_tps: Optional[float] = None
+        try:
+            if "thread" in args.engines:
+                print(f"\n🧵 thread 엔진 ({args.threads} 스레드, {args.duration:.0f}초)")
+                runs.append(bench_thread(args.threads, args.duration, order_source, make_lifecycle(args)))
+            if "async" in args.engines:
+                print(f"\n⚡ async 엔진 (동시 {args.concurrency}, {args.duration:.0f}초)")
+                runs.append(bench_async(args.concurrency, args.duration, order_source, make_lifecycle(args)))
+            if "open" in args.engines:
+                search = find_max_tps(
+                    args.start_rate, args.max_rate, args.duration, args.concurrency, order_source,
+                    slo_p99_ms=args.slo_p99_ms,
+                    max_fail_ratio=args.error_rate + args.throttle_rate + MAX_FAIL_RATIO,
+                    refine=args.refine,
+                    warmup=args.warmup,
+                    drain_timeout=args.drain_timeout
+                )
+                runs.extend(search["runs"])
+                max_tps = search["max_sustainable_tps"]
+        except KeyboardInterrupt:
+            print("\n🛑 종료 신호 감지 → 지금까지 결과만 출력")
+        finally:
+            reporter.stop()
+    finally:
+        for p in servers:
+            p.terminate()
+            p.join()
+
+    if not runs:
+        return 1
+
+    print_table(runs)
+    if max_tps is not None:
+        print(f"\n🏁 최대 지속 가능 TPS (open, p99 ≤ {args.slo_p99_ms:.0f}ms): {max_tps:.0f}")
+
+    report = {
+        "started_at": datetime.now().isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k != "baseline"},
+        "max_sustainable_tps": max_tps,
+        "runs": runs,
+    }
+    print(f"📝 결과 저장: {write_report(report, REPORT_DIR)}")
+
+    if args.baseline and not compare_baseline(report, args.baseline, args.tolerance):
+        print("❌ 처리량 회귀 감지")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
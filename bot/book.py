@@ -0,0 +1,144 @@
+# bot/book.py
+import random
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from bot.config import MARKETABLE_RATIO, BOOK_DEPTH
+from bot.price import get_cached_price, format_price, tick_size
+
+SIM_FLOOR = 1.00
+
+
+class CoinBook:
+    """
+    코인 하나의 로컬 호가창 (봇이 보낸 대기 주문 기준)
+
+    - bids / asks: {가격: 남은 수량}
+    - 즉시 체결형 주문은 반대편 최우선 호가부터 수량만큼 쓸어가는 가격으로 냄
+      → 백엔드에서 실제로 대기 주문과 매칭됨
+    - 대기형 주문은 시세(mid) 기준 1~depth 호가 안쪽에 깔고 로컬 호가창에 추가
+    """
+
+    # mid 에서 이만큼(호가 단계) 넘게 멀어진 대기 주문은 로컬 뷰에서 버림
+    PRUNE_LEVELS = 4
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self.lock = Lock()
+
+    def _sweep(self, side: Dict[float, float], ascending: bool, count: float) -> Optional[float]:
+        """반대편 호가를 좋은 가격부터 count 만큼 소진 → 마지막으로 닿은 가격"""
+        if not side:
+            return None
+
+        remaining = count
+        price = None
+        for level in sorted(side, reverse=not ascending):
+            price = level
+            filled = min(side[level], remaining)
+            remaining -= filled
+            side[level] -= filled
+            if side[level] <= 0:
+                del side[level]
+            if remaining <= 0:
+                break
+
+        # 다 못 채운 수량은 그 가격에 대기 주문으로 남음
+        if remaining > 0:
+            rest = self.bids if ascending else self.asks
+            rest[price] = rest.get(price, 0) + remaining
+        return price
+
+    def _rest(self, order_type: str, count: float, mid: float) -> float:
+        tick = tick_size(mid)
+        # 안쪽 호가일수록 자주 (1호가 ~ depth 호가)
+        levels = min(int(random.expovariate(0.5)) + 1, self.depth)
+
+        if order_type == "BUY":
+            price = format_price(mid - tick * levels)
+            if self.asks:
+                price = min(price, format_price(min(self.asks) - tick_size(min(self.asks))))
+            side = self.bids
+        else:
+            price = format_price(mid + tick * levels)
+            if self.bids:
+                price = max(price, format_price(max(self.bids) + tick_size(max(self.bids))))
+            side = self.asks
+
+        side[price] = side.get(price, 0) + count
+        return price
+
+    def _prune(self, mid: float):
+        limit = tick_size(mid) * self.depth * self.PRUNE_LEVELS
+        for side in (self.bids, self.asks):
+            for level in [p for p in side if abs(p - mid) > limit]:
+                del side[level]
+
+    def order_price(self, order_type: str, count: float, mid: float, marketable: bool) -> Tuple[float, bool]:
+        """:return: (주문 가격, 즉시 체결형 여부)"""
+        with self.lock:
+            self._prune(mid)
+
+            if marketable:
+                if order_type == "BUY":
+                    price = self._sweep(self.asks, True, count)
+                else:
+                    price = self._sweep(self.bids, False, count)
+
+                if price is not None:
+                    return price, True
+
+            # 반대편 유동성이 없으면 대기 주문으로 먼저 깔아둠
+            return self._rest(order_type, count, mid), False
+
+
+class BookPriceModel:
+    """
+    코인별 CoinBook 으로 주문 가격 결정 (create_order 의 random_price 대체)
+    marketable_ratio 비율만큼 반대편 대기 주문과 체결되는 가격을 냄
+    """
+
+    def __init__(self, marketable_ratio: float = MARKETABLE_RATIO, depth: int = BOOK_DEPTH):
+        self.marketable_ratio = marketable_ratio
+        self.depth = depth
+        self.books: Dict[str, CoinBook] = {}
+        self.lock = Lock()
+
+        self.marketable = 0
+        self.resting = 0
+
+    def book(self, coin: str) -> CoinBook:
+        book = self.books.get(coin)
+        if book is None:
+            with self.lock:
+                book = self.books.setdefault(coin, CoinBook(self.depth))
+        return book
+
+    def order_price(self, coin: str, order_type: str, count: float, mid: Optional[float] = None) -> Optional[float]:
+        """
+        :param mid: 기준 시세 (생략하면 PRICE_CACHE 조회)
+        """
+        if mid is None:
+            mid = get_cached_price(coin)
+            if mid is None:
+                return None
+
+        marketable = random.random() < self.marketable_ratio
+        price, crossed = self.book(coin).order_price(order_type, count, max(mid, SIM_FLOOR), marketable)
+
+        # 카운터는 통계용이라 락 없이 증가 (스레드 간 약간의 유실 허용)
+        if crossed:
+            self.marketable += 1
+        else:
+            self.resting += 1
+        return price
+
+    def summary(self) -> str:
+        total = self.marketable + self.resting
+        ratio = self.marketable / total if total else 0.0
+        return f"즉시 체결형 {self.marketable} / 대기형 {self.resting} (체결 유도 {ratio:.1%})"
+
+
+book_model = BookPriceModel()
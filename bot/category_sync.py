@@ -5,11 +5,48 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+UPBIT_API_URL = os.getenv("UPBIT_API_URL", "https://api.upbit.com")
+
+# 💡 무조건 포함시킬 '근본/메이저 코인' 리스트 (원하는 코인 심볼을 자유롭게 추가/수정하세요)
+VIP_COINS = ['BTC', 'ETH', 'XRP', 'SOL', 'ADA', 'DOGE', 'AVAX', 'DOT', 'LINK', 'BCH', 'SHIB']
+ACTIVE_LIMIT = 100
+
+# 업비트 KRW 마켓 전체를 한 번에 반영하는 set 기반 동기화 (마켓 수와 무관하게 DB 왕복 1회)
+# - incoming: 배열 파라미터를 unnest 로 펼친 (심볼, 활성 여부) 집합
+# - inserted: 처음 보는 심볼은 활성 여부까지 채워서 추가
+# - updated : 기존 행은 활성 여부가 실제로 바뀌는 것만 UPDATE
+#   (같은 문장의 CTE 끼리는 스냅샷을 공유해서 updated 는 방금 추가된 행을 보지 않음 → 중복 갱신 없음)
+SYNC_QUERY = """
+    WITH incoming AS (
+        SELECT DISTINCT s.symbol
+        FROM unnest(%(symbols)s::text[]) AS s(symbol)
+    ),
+    inserted AS (
+        INSERT INTO category (symbol, is_active)
+        SELECT symbol, symbol = ANY(%(active)s::text[])
+        FROM incoming
+        ON CONFLICT (symbol) DO NOTHING
+        RETURNING symbol
+    ),
+    updated AS (
+        UPDATE category c
+        SET is_active = (c.symbol = ANY(%(active)s::text[]))
+        WHERE c.is_active IS DISTINCT FROM (c.symbol = ANY(%(active)s::text[]))
+        RETURNING c.is_active
+    )
+    SELECT
+        (SELECT count(*) FROM inserted),
+        count(*) FILTER (WHERE is_active),
+        count(*) FILTER (WHERE NOT is_active)
+    FROM updated;
+"""
+
+
 def get_db_connection():
     # 배포/로컬 환경에 맞춰 접속 정보를 수정해서 사용하세요!
     return psycopg2.connect(
         host=os.getenv("DB_HOST"),
-        port=os.getenv("DB_PORT"), 
+        port=os.getenv("DB_PORT"),
         database=os.getenv("DB_NAME"),
         user=os.getenv("DB_USER"),
         password=os.getenv("DB_PASSWORD"),
@@ -17,64 +54,48 @@ def get_db_connection():
         options="-c client_encoding=UTF8"
     )
 
+
+def select_active_symbols(tickers, vip_coins=VIP_COINS, limit=ACTIVE_LIMIT):
+    """VIP 코인을 먼저 담고, 남은 자리를 24시간 거래대금 상위 코인으로 채워 limit 개 맞추기"""
+    active_symbols = set(vip_coins)  # 중복 방지를 위해 set 사용
+
+    for t in sorted(tickers, key=lambda x: x['acc_trade_price_24h'], reverse=True):
+        if len(active_symbols) >= limit:
+            break  # 100개가 다 차면 멈춤
+        active_symbols.add(t['market'].replace('KRW-', ''))
+
+    return active_symbols
+
+
 def sync_top_100_with_vip():
-    # 💡 무조건 포함시킬 '근본/메이저 코인' 리스트 (원하는 코인 심볼을 자유롭게 추가/수정하세요)
-    VIP_COINS = ['BTC', 'ETH', 'XRP', 'SOL', 'ADA', 'DOGE', 'AVAX', 'DOT', 'LINK', 'BCH', 'SHIB']
-    
     # 1. 업비트 전체 KRW 마켓 정보 가져오기
-    url = "https://api.upbit.com/v1/market/all"
-    res = requests.get(url)
-    all_markets = res.json()
-    krw_markets = [m for m in all_markets if m['market'].startswith('KRW-')]
-    
-    market_codes = [m['market'] for m in krw_markets]
-    
-    # 2. 현재 시세를 가져와서 24시간 거래대금 순으로 정렬
-    ticker_url = f"https://api.upbit.com/v1/ticker?markets={','.join(market_codes)}"
-    tickers = requests.get(ticker_url).json()
-    
-    sorted_tickers = sorted(tickers, key=lambda x: x['acc_trade_price_24h'], reverse=True)
-
-    # 3. VIP 코인을 먼저 담고, 남은 자리를 거래대금 상위 코인으로 채워 딱 100개 맞추기
-    active_symbols = set(VIP_COINS) # 중복 방지를 위해 set 사용
-    
-    for t in sorted_tickers:
-        if len(active_symbols) >= 100:
-            break # 100개가 다 차면 멈춤
-            
-        symbol = t['market'].replace('KRW-', '')
-        active_symbols.add(symbol)
-
-    # 4. DB 접속 및 비활성화/활성화 처리
+    all_markets = requests.get(f"{UPBIT_API_URL}/v1/market/all", timeout=10).json()
+    market_codes = [m['market'] for m in all_markets if m['market'].startswith('KRW-')]
+
+    # DB에 집어넣을 전체 코인 심볼 리스트 (예: BTC, ETH)
+    all_symbols = [code.replace('KRW-', '') for code in market_codes]
+
+    # 2. 현재 시세(24시간 거래대금)로 활성 코인 선정
+    tickers = requests.get(
+        f"{UPBIT_API_URL}/v1/ticker",
+        params={"markets": ",".join(market_codes)},
+        timeout=10
+    ).json()
+    active_symbols = select_active_symbols(tickers)
+
+    # 3. DB 접속 후 추가 + 활성/비활성 처리를 한 문장으로
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        cur.execute("SELECT symbol FROM category;")
-        all_db_symbols = [row[0] for row in cur.fetchall()]
-
-        # DB에 있는 전체 코인 중 active_symbols(선정된 100개)에 없는 것들은 비활성화 대상
-        symbols_to_disable = [s for s in all_db_symbols if s not in active_symbols]
-        symbols_to_enable = list(active_symbols)
-
-        if symbols_to_disable:
-            # 100위 밖 + VIP가 아닌 코인들은 비활성화
-            cur.execute(
-                "UPDATE category SET is_active = FALSE WHERE symbol = ANY(%s);",
-                (symbols_to_disable,)
-            )
-            
-        if symbols_to_enable:
-            # 선정된 100개의 코인은 확실하게 활성화
-            cur.execute(
-                "UPDATE category SET is_active = TRUE WHERE symbol = ANY(%s);",
-                (symbols_to_enable,)
-            )
-
+        cur.execute(SYNC_QUERY, {"symbols": all_symbols, "active": sorted(active_symbols)})
+        inserted, enabled, disabled = cur.fetchone()
         conn.commit()
-        print(f"✅ DB 업데이트 완벽하게 끝났습니다!")
-        print(f"👑 VIP 포함 상위 100개 세팅 완료")
-        print(f"💤 100위 밖 {len(symbols_to_disable)}개 코인 꿀잠(비활성화) 처리 완료")
+
+        print(f"✅ DB 업데이트 완벽하게 끝났습니다! (KRW 마켓 {len(all_symbols)}개)")
+        print(f"🆕 새로운 코인 {inserted}개 추가")
+        print(f"👑 VIP 포함 상위 {len(active_symbols)}개 세팅 완료 (새로 활성화 {enabled}개)")
+        print(f"💤 100위 밖 {disabled}개 코인 꿀잠(비활성화) 처리 완료")
 
     except Exception as e:
         conn.rollback()
@@ -1,5 +1,4 @@
 import os
-import requests
 import psycopg2
 from dotenv import load_dotenv
 
@@ -17,84 +16,71 @@ def get_db_connection():
         options="-c client_encoding=UTF8"
     )
 
-def sync_top_100_with_vip():
-    # 💡 무조건 포함시킬 '근본/메이저 코인' 리스트
-    VIP_COINS = ['BTC', 'ETH', 'XRP', 'SOL', 'ADA', 'DOGE', 'AVAX', 'DOT', 'LINK', 'BCH', 'SHIB']
-    
-    # 1. 업비트 전체 KRW 마켓 정보 가져오기
-    url = "https://api.upbit.com/v1/market/all"
-    res = requests.get(url)
-    all_markets = res.json()
-    krw_markets = [m for m in all_markets if m['market'].startswith('KRW-')]
-    
-    market_codes = [m['market'] for m in krw_markets]
-    
-    # DB에 집어넣을 전체 코인 심볼 리스트 (예: BTC, ETH)
-    all_symbols = [m['market'].replace('KRW-', '') for m in krw_markets]
-    
-    # 2. 현재 시세를 가져와서 24시간 거래대금 순으로 정렬
-    ticker_url = f"https://api.upbit.com/v1/ticker?markets={','.join(market_codes)}"
-    tickers = requests.get(ticker_url).json()
-    
-    sorted_tickers = sorted(tickers, key=lambda x: x['acc_trade_price_24h'], reverse=True)
-
-    # 3. VIP 코인을 먼저 담고, 남은 자리를 거래대금 상위 코인으로 채워 딱 100개 맞추기
-    active_symbols = set(VIP_COINS)
-    
-    for t in sorted_tickers:
-        if len(active_symbols) >= 100:
-            break
-            
-        symbol = t['market'].replace('KRW-', '')
-        active_symbols.add(symbol)
-
-    # 4. DB 접속 및 INSERT / UPDATE 처리
-    conn = get_db_connection()
-    cur = conn.cursor()
+# ===== 봇 설정 (.env) =====
+SPRING_ORDER_URL = os.getenv("SPRING_ORDER_URL", "http://localhost:8080/api/orders")
+SECRET_TOKEN = os.getenv("SECRET_TOKEN", "")
+BOT_ID = int(os.getenv("BOT_MEMBER_ID", "1"))
 
-    try:
-        # ⭐ [추가된 핵심 로직] 1. DB에 없는 코인은 새로 추가, 이미 있으면 무시
-        insert_query = """
-            INSERT INTO category (symbol) 
-            VALUES (%s) 
-            ON CONFLICT (symbol) DO NOTHING;
-        """
-        for symbol in all_symbols:
-            cur.execute(insert_query, (symbol,))
-
-        # 2. DB에 있는 전체 코인 목록 가져오기
-        cur.execute("SELECT symbol FROM category;")
-        all_db_symbols = [row[0] for row in cur.fetchall()]
-
-        # 3. 비활성화/활성화 대상 분류
-        symbols_to_disable = [s for s in all_db_symbols if s not in active_symbols]
-        symbols_to_enable = list(active_symbols)
-
-        # 4. 상태 업데이트
-        if symbols_to_disable:
-            cur.execute(
-                "UPDATE category SET is_active = FALSE WHERE symbol = ANY(%s);",
-                (symbols_to_disable,)
-            )
-            
-        if symbols_to_enable:
-            cur.execute(
-                "UPDATE category SET is_active = TRUE WHERE symbol = ANY(%s);",
-                (symbols_to_enable,)
-            )
-
-        conn.commit()
-        print(f"✅ DB 업데이트가 완벽하게 끝났습니다!")
-        print(f"🆕 새로운 코인 추가(INSERT) 및 중복 검사 완료")
-        print(f"👑 VIP 포함 상위 100개 세팅 완료")
-        print(f"💤 100위 밖 {len(symbols_to_disable)}개 코인 꿀잠(비활성화) 처리 완료")
+THREADS = int(os.getenv("BOT_THREADS", "10"))
+ORDER_INTERVAL = float(os.getenv("ORDER_INTERVAL", "0.5"))  # seconds
 
-    except Exception as e:
-        conn.rollback()
-        print(f"❌ 오류 발생: {e}")
-    finally:
+# 시세 공급 방식: rest (배치 REST 백그라운드 갱신) / ws (업비트 WebSocket 스트림)
+PRICE_SOURCE = os.getenv("BOT_PRICE_SOURCE", "rest")
+UPBIT_API_URL = os.getenv("UPBIT_API_URL", "https://api.upbit.com")  # 로컬 벤치마크: bot.mock_server
+UPBIT_WS_URL = os.getenv("UPBIT_WS_URL", "wss://api.upbit.com/websocket/v1")
+
+# 주문 가격 모델: random (시세 ±5% 균등) / book (로컬 호가창 기준 즉시 체결형 + 대기형 주문)
+PRICE_MODEL = os.getenv("BOT_PRICE_MODEL", "random")
+MARKETABLE_RATIO = float(os.getenv("BOT_MARKETABLE_RATIO", "0.3"))  # book 모델의 즉시 체결형 주문 비율
+BOOK_DEPTH = int(os.getenv("BOT_BOOK_DEPTH", "10"))  # 대기 주문을 깔 호가 단계 수
+
+# asyncio 엔진 설정 (동시 요청 수 = 커넥션 풀 크기)
+CONCURRENCY = int(os.getenv("BOT_CONCURRENCY", "200"))
+HTTP_TIMEOUT = float(os.getenv("BOT_HTTP_TIMEOUT", "10"))  # seconds
+
+# 페이싱: 전체 TPS 상한(토큰 버킷, 0 이면 없음) / 429·503·지연 급증 시 동시 요청 수 자동 조절(AIMD)
+RATE_LIMIT = float(os.getenv("BOT_RATE_LIMIT", "0"))
+ADAPTIVE = os.getenv("BOT_ADAPTIVE", "false").lower() in ("1", "true", "yes")
+
+# 실행 단계: 워밍업(집계 제외) → 측정 → 드레인(in-flight 요청 대기 상한)
+WARMUP = float(os.getenv("BOT_WARMUP", "5"))  # seconds
+DRAIN_TIMEOUT = float(os.getenv("BOT_DRAIN_TIMEOUT", "5"))  # seconds
+
+# 지연시간 리포트 (주기 출력 간격 / 종료 시 JSON·CSV 저장 위치)
+REPORT_INTERVAL = float(os.getenv("BOT_REPORT_INTERVAL", "5"))  # seconds
+REPORT_DIR = os.getenv("BOT_REPORT_DIR", "reports")
+# 주문별 로그 샘플링 비율 (0.01 = 1%). 0 이면 주기 요약 줄만 출력
+LOG_SAMPLE = float(os.getenv("BOT_LOG_SAMPLE", "0"))
+
+
+def load_category_map():
+    """DB의 활성 코인 심볼 → category_id 매핑 (봇 시작 시 1회 로드)"""
+    # DB 없이 실행할 때 (벤치마크 등): BOT_CATEGORY_MAP="BTC:1,ETH:2"
+    override = os.getenv("BOT_CATEGORY_MAP")
+    if override:
+        pairs = (item.split(":") for item in override.split(",") if item.strip())
+        return {symbol.strip().upper(): int(category_id) for symbol, category_id in pairs}
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT symbol, category_id FROM category WHERE is_active = TRUE;")
+        rows = cur.fetchall()
         cur.close()
         conn.close()
+        return {r[0].strip().upper(): r[1] for r in rows}
+    except Exception as e:
+        print(f"⚠️ 카테고리 로드 실패: {e}")
+        return {}
+
+
+CATEGORY_MAP = load_category_map()
+COINS = list(CATEGORY_MAP.keys())
+
+def sync_top_100_with_vip():
+    """카테고리 동기화는 bot/category_sync.py 의 set 기반 upsert 로 일원화"""
+    from bot.category_sync import sync_top_100_with_vip as sync
+    sync()
 
 if __name__ == "__main__":
     sync_top_100_with_vip()
\ No newline at end of file
@@ -1,6 +1,11 @@
 # bot/interpolator.py
 import random
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 차트 자연스러움용 미세 노이즈 폭 (±0.015%)
+NOISE = 0.00015
 
 
 class EMA:
@@ -30,12 +35,15 @@ class SmoothPriceInterpolator:
         self,
         alpha: float = 0.15,
         max_change: float = 0.003,   # 0.3%
-        steps: int = 6
+        steps: int = 6,
+        seed: Optional[int] = None
     ):
         self.alpha = alpha
         self.max_change = max_change
         self.steps = steps
         self.state: Dict[str, Dict] = {}
+        # seed 를 주면 노이즈 재현 가능 (VectorizedPriceInterpolator 와 동일 결과)
+        self.rng = random.Random(seed) if seed is not None else random
 
     def _clamp_raw(self, prev_raw: float, new_raw: float) -> float:
         diff = new_raw - prev_raw
@@ -82,10 +90,106 @@ class SmoothPriceInterpolator:
         for raw in interpolated_raw:
             smooth_price = ema.update(raw)
 
-            noise = smooth_price * random.uniform(-0.00015, 0.00015)
+            noise = smooth_price * self.rng.uniform(-NOISE, NOISE)
             result.append(round(smooth_price + noise, 4))
 
         # 5️⃣ 상태 업데이트
         state["last_raw"] = clamped_raw
 
         return result
+
+
+class VectorizedPriceInterpolator:
+    """
+    SmoothPriceInterpolator 의 NumPy 버전 (수백 개 마켓 동시 처리용)
+
+    - last_raw / EMA 상태를 마켓 인덱스 기준 배열로 보관
+    - clamp → 보간 → EMA → 노이즈를 전체 마켓에 대해 한 번에 계산
+    - 같은 seed 면 SmoothPriceInterpolator 에 같은 순서로 smooth() 한 것과 결과가 동일
+      (random.Random(seed) 와 RandomState([seed]) 는 같은 난수열, 0 <= seed < 2**32)
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.15,
+        max_change: float = 0.003,   # 0.3%
+        steps: int = 6,
+        seed: Optional[int] = None
+    ):
+        self.alpha = alpha
+        self.max_change = max_change
+        self.steps = steps
+
+        self.index: Dict[str, int] = {}
+        self.last_raw = np.empty(0)
+        self.ema = np.empty(0)
+
+        self.rng = np.random.RandomState([seed]) if seed is not None else np.random.RandomState()
+        self._frame_no = np.arange(1, steps + 1)
+
+    def smooth_many(self, coins: Sequence[str], prices: Sequence[float]) -> Dict[str, List[float]]:
+        """
+        :param coins: 마켓 목록 (중복 불가)
+        :param prices: coins 와 같은 순서의 거래소 원본 가격
+        :return: {coin: 차트용 가격 리스트}
+        """
+        if len(set(coins)) != len(coins):
+            raise ValueError("smooth_many() 에 같은 코인이 두 번 들어왔습니다")
+
+        prices = np.asarray(prices, dtype=float)
+        known = np.array([c in self.index for c in coins], dtype=bool)
+
+        result: Dict[str, List[float]] = {}
+
+        # 1️⃣ 최초 수신 → 그대로 1개만 반환
+        for coin, price in zip(np.asarray(coins, dtype=object)[~known], prices[~known]):
+            self.index[coin] = len(self.index)
+            result[coin] = [round(float(price), 4)]
+        if (~known).any():
+            self.last_raw = np.concatenate([self.last_raw, prices[~known]])
+            self.ema = np.concatenate([self.ema, prices[~known]])
+
+        if not known.any():
+            return result
+
+        old_coins = [c for c, k in zip(coins, known) if k]
+        idx = np.array([self.index[c] for c in old_coins])
+        prev_raw = self.last_raw[idx]
+        new_raw = prices[known]
+
+        # 2️⃣ raw 기준 clamp
+        diff = new_raw - prev_raw
+        limit = prev_raw * self.max_change
+        clamped_raw = np.where(
+            np.abs(diff) > limit,
+            prev_raw + limit * np.where(diff > 0, 1.0, -1.0),
+            new_raw
+        )
+
+        # 3️⃣ raw 기준 보간 (마켓 × 프레임)
+        delta = (clamped_raw - prev_raw) / self.steps
+        interpolated_raw = prev_raw[:, None] + delta[:, None] * self._frame_no
+
+        # 4️⃣ EMA (프레임 방향 점화식, 마켓 방향은 벡터) + 미세 노이즈
+        ema = self.ema[idx]
+        smooth = np.empty_like(interpolated_raw)
+        for j in range(self.steps):
+            ema = self.alpha * interpolated_raw[:, j] + (1 - self.alpha) * ema
+            smooth[:, j] = ema
+
+        noise = smooth * self.rng.uniform(-NOISE, NOISE, size=smooth.shape)
+        frames = smooth + noise
+
+        # 5️⃣ 상태 업데이트
+        self.last_raw[idx] = clamped_raw
+        self.ema[idx] = ema
+
+        # round 는 파이썬 round 로 맞춰야 스칼라 버전과 완전히 동일
+        for coin, row in zip(old_coins, frames.tolist()):
+            result[coin] = [round(v, 4) for v in row]
+
+        return result
+
+    def smooth(self, coin: str, new_raw_price: float) -> List[float]:
+        """SmoothPriceInterpolator.smooth() 와 같은 인터페이스"""
+        return self.smooth_many([coin], [new_raw_price])[coin]
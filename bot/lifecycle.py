@@ -0,0 +1,114 @@
+# bot/lifecycle.py
+import asyncio
+import time
+from threading import Thread
+from typing import Iterable, Optional
+
+from bot.config import WARMUP, DRAIN_TIMEOUT
+from bot.metrics import MetricsRecorder, recorder as default_recorder
+
+
+class Lifecycle:
+    """
+    엔진 실행 단계: 워밍업 → 측정 → 드레인
+
+    - 워밍업: 커넥션 풀 / 시세 캐시 / JIT 성 초기 비용이 빠질 때까지 부하만 걸고 집계하지 않음
+    - 측정  : recorder 측정 구간 (요청 '시작 시각'이 이 구간 안이면 집계)
+    - 드레인: 새 요청은 멈추고 in-flight 요청을 drain_timeout 까지만 기다린 뒤 포기(취소)
+    → TPS = 측정 구간 안에서 시작된 요청 수 / 측정 구간 길이 (유휴 시간 제외)
+    """
+
+    def __init__(
+        self,
+        warmup: float = WARMUP,
+        drain_timeout: float = DRAIN_TIMEOUT,
+        recorder: MetricsRecorder = default_recorder
+    ):
+        self.warmup = warmup
+        self.drain_timeout = drain_timeout
+        self.recorder = recorder
+        self.abandoned = 0
+
+    @property
+    def elapsed(self) -> float:
+        return self.recorder.measured_elapsed() or 0.0
+
+    def begin_measure(self, at: Optional[float] = None):
+        self.recorder.begin_measure(at)
+        print("📏 측정 시작" + (f" (워밍업 {self.warmup:.0f}초 제외)" if self.warmup > 0 else ""))
+
+    def end_measure(self, at: Optional[float] = None):
+        if self.recorder.measure_until is None:
+            self.recorder.end_measure(at)
+            print(f"🧹 드레인 (in-flight 요청 최대 {self.drain_timeout:.0f}초 대기)")
+
+    def plan(self, started: float, duration: float):
+        """오픈 루프: 스케줄 시작 시각 기준으로 측정 구간을 미리 정함 (앞 warmup 초는 집계 제외)"""
+        self.recorder.begin_measure(started + self.warmup)
+        if self.warmup > 0:
+            print(f"🔥 워밍업 {self.warmup:.0f}초 → 📏 {duration:.0f}초 측정")
+
+    # ===== 스레드 엔진 =====
+    def run_blocking(self, duration: Optional[float] = None):
+        """워밍업 + 측정 구간 동안 블로킹 (Ctrl-C 면 그 시점에 측정 종료)"""
+        try:
+            if self.warmup > 0:
+                print(f"🔥 워밍업 {self.warmup:.0f}초")
+                time.sleep(self.warmup)
+            self.begin_measure()
+
+            if duration is None:
+                while True:
+                    time.sleep(1)
+            else:
+                time.sleep(duration)
+        except KeyboardInterrupt:
+            print("\n🛑 종료 신호 감지")
+        finally:
+            if self.recorder.measure_from is None:
+                self.begin_measure()
+            self.end_measure()
+
+    def join(self, threads: Iterable[Thread]):
+        """워커 스레드를 drain_timeout 까지만 기다림 (남은 스레드는 daemon 이라 종료 시 버려짐)"""
+        deadline = time.monotonic() + self.drain_timeout
+        for t in threads:
+            t.join(max(deadline - time.monotonic(), 0))
+            if t.is_alive():
+                self.abandoned += 1
+
+        if self.abandoned:
+            print(f"⚠️ 드레인 시간 초과: 응답 대기 중인 워커 {self.abandoned}개를 버리고 종료")
+
+    # ===== asyncio 엔진 =====
+    async def run_async(self, duration: Optional[float] = None):
+        """워밍업 + 측정 구간 동안 대기 (취소되면 그 시점에 측정 종료)"""
+        try:
+            if self.warmup > 0:
+                print(f"🔥 워밍업 {self.warmup:.0f}초")
+                await asyncio.sleep(self.warmup)
+            self.begin_measure()
+
+            if duration is None:
+                await asyncio.Event().wait()
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            if self.recorder.measure_from is None:
+                self.begin_measure()
+            self.end_measure()
+
+    async def drain(self, tasks: Iterable[asyncio.Task]):
+        """in-flight 태스크를 drain_timeout 까지 기다리고 남은 것은 취소"""
+        tasks = [t for t in tasks if not t.done()]
+        if not tasks:
+            return
+
+        _, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+        for t in pending:
+            t.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        self.abandoned += len(pending)
+        if pending:
+            print(f"⚠️ 드레인 시간 초과: in-flight 요청 {len(pending)}건 취소")
@@ -0,0 +1,138 @@
+# bot/load_profile.py
+import random
+from typing import Iterator, Optional
+
+
+class LoadProfile:
+    """
+    오픈 루프 부하 프로파일 (목표 TPS 곡선)
+
+    - rate_at(t): 시작 후 t초 시점의 목표 TPS
+    - arrivals(): 주문을 보내야 하는 시각(시작 기준 초) 스케줄
+      → 응답 속도와 무관하게 이 스케줄대로 주문이 나감
+    - poisson=True 이면 간격이 지수분포 (평균 TPS는 동일)
+    """
+
+    # 목표 TPS가 0인 구간은 이 간격으로 건너뜀
+    IDLE_STEP = 0.01
+
+    def __init__(self, poisson: bool = False, seed: Optional[int] = None):
+        self.poisson = poisson
+        self.rng = random.Random(seed)
+
+    def rate_at(self, t: float) -> float:
+        raise NotImplementedError
+
+    def arrivals(self, duration: float) -> Iterator[float]:
+        t = 0.0
+        while t < duration:
+            rate = self.rate_at(t)
+
+            if rate <= 0:
+                t += self.IDLE_STEP
+                continue
+
+            yield t
+
+            if self.poisson:
+                t += self.rng.expovariate(rate)
+            else:
+                t += 1.0 / rate
+
+    def describe(self) -> str:
+        kind = "poisson" if self.poisson else "fixed"
+        return f"{self.__class__.__name__}({kind})"
+
+
+class ConstantProfile(LoadProfile):
+    def __init__(self, rate: float, **kwargs):
+        super().__init__(**kwargs)
+        self.rate = rate
+
+    def rate_at(self, t: float) -> float:
+        return self.rate
+
+    def describe(self) -> str:
+        return f"{super().describe()} {self.rate:.0f} TPS"
+
+
+class RampProfile(LoadProfile):
+    """start_rate → end_rate 로 ramp_time 동안 선형 증가, 이후 end_rate 유지"""
+
+    def __init__(self, start_rate: float, end_rate: float, ramp_time: float, **kwargs):
+        super().__init__(**kwargs)
+        self.start_rate = start_rate
+        self.end_rate = end_rate
+        self.ramp_time = ramp_time
+
+    def rate_at(self, t: float) -> float:
+        if t >= self.ramp_time:
+            return self.end_rate
+        return self.start_rate + (self.end_rate - self.start_rate) * t / self.ramp_time
+
+    def describe(self) -> str:
+        return (
+            f"{super().describe()} {self.start_rate:.0f} → {self.end_rate:.0f} TPS "
+            f"({self.ramp_time:.0f}s)"
+        )
+
+
+class StepProfile(LoadProfile):
+    """start_rate 부터 step_every 초마다 step_rate 씩 증가 (max_rate 상한)"""
+
+    def __init__(
+        self,
+        start_rate: float,
+        step_rate: float,
+        step_every: float,
+        max_rate: Optional[float] = None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.start_rate = start_rate
+        self.step_rate = step_rate
+        self.step_every = step_every
+        self.max_rate = max_rate
+
+    def rate_at(self, t: float) -> float:
+        rate = self.start_rate + self.step_rate * int(t // self.step_every)
+        if self.max_rate is not None:
+            rate = min(rate, self.max_rate)
+        return rate
+
+    def describe(self) -> str:
+        return (
+            f"{super().describe()} {self.start_rate:.0f} TPS "
+            f"+{self.step_rate:.0f} / {self.step_every:.0f}s"
+        )
+
+
+def build_profile(
+    name: str,
+    rate: float,
+    duration: float,
+    end_rate: Optional[float] = None,
+    step_rate: Optional[float] = None,
+    step_every: float = 10.0,
+    seed: Optional[int] = None
+) -> LoadProfile:
+    """run_bot.py 인자 → 프로파일 객체"""
+
+    if name == "constant":
+        return ConstantProfile(rate)
+
+    if name == "poisson":
+        return ConstantProfile(rate, poisson=True, seed=seed)
+
+    if name == "ramp":
+        return RampProfile(rate, end_rate if end_rate is not None else rate * 2, duration)
+
+    if name == "step":
+        return StepProfile(
+            rate,
+            step_rate if step_rate is not None else rate,
+            step_every,
+            max_rate=end_rate
+        )
+
+    raise ValueError(f"알 수 없는 부하 프로파일: {name}")
@@ -0,0 +1,394 @@
+# bot/metrics.py
+import csv
+import json
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from queue import SimpleQueue, Empty
+from typing import Callable, Dict, Optional, Tuple
+
+from bot.config import LOG_SAMPLE
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HDR 스타일 log-linear 지연시간 히스토그램 (µs 단위)
+
+    - 2048µs 미만은 1µs 단위, 그 이상은 2배 구간마다 1024개 버킷
+      → 전 구간 상대 오차 0.1% 이하 (유효숫자 3자리)
+    - 버킷 카운트만 들고 있으므로 merge / 직렬화가 가벼움
+    """
+
+    SUB_BITS = 11
+    SUB_COUNT = 1 << SUB_BITS
+    HALF = SUB_COUNT >> 1
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    @classmethod
+    def _index(cls, us: int) -> int:
+        if us < cls.SUB_COUNT:
+            return us
+        shift = us.bit_length() - cls.SUB_BITS
+        return cls.SUB_COUNT + (shift - 1) * cls.HALF + ((us >> shift) - cls.HALF)
+
+    @classmethod
+    def _upper(cls, index: int) -> int:
+        """버킷이 포함하는 가장 큰 µs 값"""
+        if index < cls.SUB_COUNT:
+            return index
+        offset = index - cls.SUB_COUNT
+        shift = offset // cls.HALF + 1
+        sub = offset % cls.HALF + cls.HALF
+        return ((sub + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        us = max(int(seconds * 1_000_000), 0)
+        index = self._index(us)
+
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_us += us
+        if self.min_us is None or us < self.min_us:
+            self.min_us = us
+        if us > self.max_us:
+            self.max_us = us
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        if other.max_us > self.max_us:
+            self.max_us = other.max_us
+
+    def percentile(self, p: float) -> float:
+        """p 백분위 지연시간 (초)"""
+        if self.count == 0:
+            return 0.0
+
+        target = max(math.ceil(self.count * p / 100), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper(index), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def mean(self) -> float:
+        return self.total_us / self.count / 1_000_000 if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """count / mean / p50~p99.9 / max (ms)"""
+        row = {
+            "count": self.count,
+            "mean_ms": round(self.mean() * 1000, 3),
+        }
+        for p in PERCENTILES:
+            row[f"p{p:g}_ms"] = round(self.percentile(p) * 1000, 3)
+        row["max_ms"] = round(self.max_us / 1000, 3)
+        return row
+
+    def to_dict(self) -> Dict:
+        return {
+            "counts": {str(i): n for i, n in self.counts.items()},
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        hist = cls()
+        hist.counts = {int(i): n for i, n in data["counts"].items()}
+        hist.count = data["count"]
+        hist.total_us = data["total_us"]
+        hist.min_us = data["min_us"]
+        hist.max_us = data["max_us"]
+        return hist
+
+
+def format_latency(hist: LatencyHistogram) -> str:
+    parts = [f"p{p:g} {hist.percentile(p) * 1000:.1f}ms" for p in PERCENTILES]
+    parts.append(f"max {hist.max_us / 1000:.1f}ms")
+    return " | ".join(parts)
+
+
+class MetricsRecorder:
+    """
+    주문 전송 결과 집계
+    - 전체 / (코인, 주문 타입)별 지연시간 히스토그램
+    - 주기 출력용 rolling window (take_window 호출마다 초기화)
+    - 응답 코드별 카운트
+
+    워커(요청 경로)는 record()/log() 로 큐에 넣기만 하고,
+    히스토그램 갱신과 콘솔 출력은 drain() 을 호출하는 리포터 스레드 하나가 전담
+    → 워커끼리 락/콘솔 I/O 를 두고 경쟁하지 않음
+    """
+
+    def __init__(self, log_sample: float = 0.0):
+        self.lock = threading.Lock()
+        self.queue: SimpleQueue = SimpleQueue()
+
+        # 주문별 로그 샘플링 비율 (0 이면 실패 코드별 첫 1건만 출력)
+        self.log_sample = log_sample
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.started = time.time()
+        self.logged_status = set()
+
+        # 측정 구간 (time.monotonic). 요청 시작 시각이 이 구간 밖이면 집계하지 않음
+        self.measure_from: Optional[float] = None
+        self.measure_until: Optional[float] = None
+
+        self.success = 0
+        self.fail = 0
+        self.status: Dict[str, int] = {}
+        self.total = LatencyHistogram()
+        self.by_key: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+        self.window = LatencyHistogram()
+        self.window_success = 0
+        self.window_fail = 0
+        self.window_started = time.monotonic()
+
+    def reset(self):
+        """집계 초기화 (벤치마크처럼 한 프로세스에서 여러 번 측정할 때)"""
+        with self.lock:
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except Empty:
+                    break
+            self._reset_counters()
+
+    def begin_measure(self, at: Optional[float] = None):
+        """워밍업 결과를 버리고 측정 시작 (at: 측정 시작 시각, 기본 지금)"""
+        self.reset()
+        self.measure_from = at if at is not None else time.monotonic()
+
+    def end_measure(self, at: Optional[float] = None):
+        """이후 시작된 요청은 집계 제외 (이미 보낸 요청의 응답은 드레인 동안 계속 집계)"""
+        if self.measure_until is None:
+            self.measure_until = at if at is not None else time.monotonic()
+
+    def measured_elapsed(self) -> Optional[float]:
+        if self.measure_from is None or self.measure_until is None:
+            return None
+        return max(self.measure_until - self.measure_from, 0.0)
+
+    # ===== 요청 경로 (워커 스레드 / 코루틴) =====
+    def record(
+        self,
+        coin: str,
+        order_type: str,
+        latency: float,
+        ok: bool,
+        status: str,
+        started: Optional[float] = None
+    ):
+        """:param started: 요청 시작 시각 (time.monotonic), 측정 구간 밖이면 버림"""
+        if started is not None:
+            if self.measure_from is not None and started < self.measure_from:
+                return
+            if self.measure_until is not None and started >= self.measure_until:
+                return
+        self.queue.put((coin, order_type, latency, ok, status))
+
+    def should_sample(self) -> bool:
+        return self.log_sample > 0 and random.random() < self.log_sample
+
+    def log(self, message: str):
+        self.queue.put(message)
+
+    def log_failure(self, status: str, detail: str):
+        # 같은 응답 코드는 처음 1건 + 샘플링된 것만 출력
+        if status in self.logged_status and not self.should_sample():
+            return
+        self.logged_status.add(status)
+        self.log(f"❌ FAIL {status}\n   응답: {detail}")
+
+    # ===== 리포터 =====
+    def drain(self):
+        """큐에 쌓인 결과를 히스토그램에 반영하고 로그를 출력"""
+        with self.lock:
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except Empty:
+                    break
+
+                if isinstance(item, str):
+                    print(item)
+                else:
+                    self._apply(*item)
+
+    def _apply(self, coin: str, order_type: str, latency: float, ok: bool, status: str):
+        if ok:
+            self.success += 1
+            self.window_success += 1
+        else:
+            self.fail += 1
+            self.window_fail += 1
+
+        self.status[status] = self.status.get(status, 0) + 1
+        self.total.record(latency)
+        self.window.record(latency)
+
+        key = (coin, order_type)
+        hist = self.by_key.get(key)
+        if hist is None:
+            hist = self.by_key[key] = LatencyHistogram()
+        hist.record(latency)
+
+    def take_window(self) -> Tuple[LatencyHistogram, int, int, float]:
+        """현재 rolling window 를 떼어내고 새 window 시작"""
+        self.drain()
+
+        with self.lock:
+            window, ok, ng = self.window, self.window_success, self.window_fail
+            elapsed = time.monotonic() - self.window_started
+
+            self.window = LatencyHistogram()
+            self.window_success = 0
+            self.window_fail = 0
+            self.window_started = time.monotonic()
+
+        return window, ok, ng, elapsed
+
+    def print_window(self):
+        print_window(*self.take_window())
+
+    def print_percentiles(self):
+        print(f"지연시간  : {format_latency(self.total)}")
+
+    # ===== 멀티 프로세스 집계 =====
+    def export(self) -> Dict:
+        """히스토그램 원본(버킷 카운트)까지 담은 상태 → 부모 프로세스로 전달"""
+        self.drain()
+
+        with self.lock:
+            return {
+                "success": self.success,
+                "fail": self.fail,
+                "elapsed": self.measured_elapsed(),
+                "status": dict(self.status),
+                "total": self.total.to_dict(),
+                "by_key": [
+                    [coin, order_type, hist.to_dict()]
+                    for (coin, order_type), hist in self.by_key.items()
+                ],
+            }
+
+    def merge_export(self, data: Dict):
+        with self.lock:
+            self.success += data["success"]
+            self.fail += data["fail"]
+            for status, n in data["status"].items():
+                self.status[status] = self.status.get(status, 0) + n
+
+            self.total.merge(LatencyHistogram.from_dict(data["total"]))
+            for coin, order_type, hist_data in data["by_key"]:
+                key = (coin, order_type)
+                hist = self.by_key.get(key)
+                if hist is None:
+                    hist = self.by_key[key] = LatencyHistogram()
+                hist.merge(LatencyHistogram.from_dict(hist_data))
+
+    def to_dict(self) -> Dict:
+        self.drain()
+
+        with self.lock:
+            return {
+                "started_at": datetime.fromtimestamp(self.started).isoformat(),
+                "elapsed_s": round(self.measured_elapsed() or time.time() - self.started, 3),
+                "success": self.success,
+                "fail": self.fail,
+                "status": dict(self.status),
+                "overall": self.total.summary(),
+                "by_key": [
+                    {"coin": coin, "orderType": order_type, **hist.summary()}
+                    for (coin, order_type), hist in sorted(self.by_key.items())
+                ],
+            }
+
+    def write_report(self, directory: str) -> Tuple[str, str]:
+        """종료 시 JSON(전체) + CSV(코인/타입별) 리포트 저장"""
+        os.makedirs(directory, exist_ok=True)
+        report = self.to_dict()
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        json_path = os.path.join(directory, f"bot_report_{stamp}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        csv_path = os.path.join(directory, f"bot_report_{stamp}.csv")
+        rows = [{"coin": "ALL", "orderType": "ALL", **report["overall"]}] + report["by_key"]
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        return json_path, csv_path
+
+
+def print_window(window: LatencyHistogram, ok: int, ng: int, elapsed: float):
+    total = ok + ng
+    print(
+        f"📊 [{elapsed:.0f}s] {total}건 {total / elapsed:.1f} TPS "
+        f"(✅{ok} ❌{ng}) {format_latency(window)}"
+    )
+
+
+class MetricsReporter(threading.Thread):
+    """
+    단일 리포터 스레드
+    - DRAIN_INTERVAL 마다 큐를 비움 (큐가 무한정 쌓이지 않도록)
+    - interval 초마다 rolling window 를 sink 로 넘김 (기본: 한 줄 요약 출력)
+    """
+
+    DRAIN_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        recorder: MetricsRecorder,
+        interval: float,
+        sink: Callable[[LatencyHistogram, int, int, float], None] = print_window
+    ):
+        super().__init__(name="BOT-REPORTER", daemon=True)
+        self.recorder = recorder
+        self.interval = interval
+        self.sink = sink
+        self.stopped = threading.Event()
+
+    def run(self):
+        next_print = time.monotonic() + self.interval
+
+        while not self.stopped.wait(self.DRAIN_INTERVAL):
+            if time.monotonic() >= next_print:
+                self.sink(*self.recorder.take_window())
+                next_print += self.interval
+            else:
+                self.recorder.drain()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.recorder.drain()
+
+
+recorder = MetricsRecorder(log_sample=LOG_SAMPLE)
@@ -0,0 +1,228 @@
+# bot/mock_server.py
+"""
+로컬 목 서버 (Spring 주문 API + 업비트 REST 시세 대역, 오프라인 벤치마크용)
+
+    python -m bot.mock_server --port 18080 --latency-ms 5 --jitter-ms 2 --error-rate 0.01
+
+봇 쪽 .env
+    SPRING_ORDER_URL=http://127.0.0.1:18080/api/orders
+    UPBIT_API_URL=http://127.0.0.1:18080
+    BOT_CATEGORY_MAP=BTC:1,ETH:2,...   (DB 없이 실행)
+
+- POST /api/orders      : latency(고정) + jitter(지수분포 꼬리) 만큼 지연 후 200
+                          error_rate 확률로 500, throttle_rate 확률로 429
+                          동시 처리 중인 요청이 capacity 를 넘으면 즉시 503 (포화 흉내)
+- GET  /v1/market/all   : markets 목록의 KRW 마켓
+- GET  /v1/ticker       : 코인별 랜덤 워크 시세
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+DEFAULT_MARKETS = [
+    "BTC", "ETH", "SOL", "XRP", "DOGE", "ADA", "DOT", "LINK", "AVAX", "BCH",
+    "SHIB", "TRX", "ETC", "NEAR", "SUI", "APT", "ARB", "SAND", "HBAR", "STX"
+]
+
+
+class MockState:
+    def __init__(
+        self,
+        markets: List[str],
+        latency: float,
+        jitter: float,
+        error_rate: float,
+        throttle_rate: float,
+        capacity: Optional[int],
+        token: Optional[str]
+    ):
+        self.markets = markets
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.capacity = capacity
+        self.token = token
+
+        # 코인마다 고정된 기준가 (프로세스가 여러 개여도 같은 값에서 출발)
+        self.prices: Dict[str, float] = {
+            m: 10 ** (zlib.crc32(m.encode()) % 7) * (1 + zlib.crc32(m.encode()) % 100 / 100)
+            for m in markets
+        }
+
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.status: Dict[int, int] = {}
+
+    def delay(self) -> float:
+        if self.jitter > 0:
+            return self.latency + random.expovariate(1 / self.jitter)
+        return self.latency
+
+    def count(self, status: int):
+        self.status[status] = self.status.get(status, 0) + 1
+
+
+async def handle_order(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    await request.read()
+
+    if state.token and request.headers.get("X-Internal-Token") != state.token:
+        state.count(401)
+        return web.json_response({"message": "invalid token"}, status=401)
+
+    if state.capacity is not None and state.inflight >= state.capacity:
+        state.count(503)
+        return web.json_response({"message": "server busy"}, status=503)
+
+    state.inflight += 1
+    state.peak_inflight = max(state.peak_inflight, state.inflight)
+    try:
+        await asyncio.sleep(state.delay())
+    finally:
+        state.inflight -= 1
+
+    roll = random.random()
+    if roll < state.error_rate:
+        state.count(500)
+        return web.json_response({"message": "injected error"}, status=500)
+    if roll < state.error_rate + state.throttle_rate:
+        state.count(429)
+        return web.json_response({"message": "too many requests"}, status=429)
+
+    state.count(200)
+    return web.json_response({"orderId": random.getrandbits(48), "status": "ACCEPTED"})
+
+
+async def handle_markets(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    return web.json_response([
+        {"market": f"KRW-{m}", "korean_name": m, "english_name": m}
+        for m in state.markets
+    ])
+
+
+async def handle_ticker(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    codes = [c for c in request.query.get("markets", "").split(",") if c]
+
+    tickers = []
+    for code in codes:
+        coin = code.replace("KRW-", "")
+        if coin not in state.prices:
+            continue
+        state.prices[coin] *= 1 + random.gauss(0, 0.001)
+        tickers.append({
+            "market": code,
+            "trade_price": round(state.prices[coin], 4),
+            "acc_trade_price_24h": state.prices[coin] * 1_000_000,
+            "timestamp": int(time.time() * 1000)
+        })
+
+    if not tickers:
+        return web.json_response({"error": {"name": 404, "message": "Code not found"}}, status=404)
+    return web.json_response(tickers)
+
+
+async def report_loop(state: MockState, interval: float):
+    last_total = 0
+    while True:
+        await asyncio.sleep(interval)
+        total = sum(state.status.values())
+        print(
+            f"🧪 [mock] {(total - last_total) / interval:.1f} req/s "
+            f"(누적 {total}, 최대 동시 {state.peak_inflight}) {state.status}"
+        )
+        last_total = total
+        state.peak_inflight = state.inflight
+
+
+def make_app(state: MockState, report_interval: float = 0.0) -> web.Application:
+    app = web.Application()
+    app["state"] = state
+    app.router.add_post("/api/orders", handle_order)
+    app.router.add_get("/v1/market/all", handle_markets)
+    app.router.add_get("/v1/ticker", handle_ticker)
+
+    if report_interval > 0:
+        async def start_report(app):
+            app["report"] = asyncio.create_task(report_loop(state, report_interval))
+
+        async def stop_report(app):
+            app["report"].cancel()
+
+        app.on_startup.append(start_report)
+        app.on_cleanup.append(stop_report)
+
+    return app
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 18080,
+    markets: Optional[List[str]] = None,
+    latency_ms: float = 5.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    capacity: Optional[int] = None,
+    token: Optional[str] = None,
+    report_interval: float = 0.0,
+    reuse_port: bool = False
+):
+    """
+    목 서버 실행 (블로킹)
+    :param reuse_port: 같은 포트에 여러 프로세스를 띄워 커널이 연결을 나눠 받게 함 (Linux)
+    """
+    state = MockState(
+        markets or DEFAULT_MARKETS,
+        latency_ms / 1000,
+        jitter_ms / 1000,
+        error_rate,
+        throttle_rate,
+        capacity,
+        token
+    )
+    web.run_app(
+        make_app(state, report_interval),
+        host=host,
+        port=port,
+        reuse_port=reuse_port,
+        access_log=None,
+        print=None
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주문 API / 업비트 시세 로컬 목 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--markets", default=",".join(DEFAULT_MARKETS), help="KRW 마켓 코인 목록 (콤마 구분)")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="주문 응답 고정 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지수분포 추가 지연 평균 (꼬리 지연)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--capacity", type=int, default=None, help="동시 처리 상한 (넘으면 503)")
+    parser.add_argument("--token", default=None, help="X-Internal-Token 검증 값 (생략 시 검증 안 함)")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="처리량 출력 간격(초), 0 이면 끔")
+    args = parser.parse_args()
+
+    print(f"▶️ 목 서버 가동: http://{args.host}:{args.port} (주문 지연 {args.latency_ms}ms)")
+    serve(
+        args.host,
+        args.port,
+        markets=[m.strip().upper() for m in args.markets.split(",") if m.strip()],
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        capacity=args.capacity,
+        token=args.token,
+        report_interval=args.report_interval
+    )
+    print("\n🛑 목 서버 종료")
@@ -0,0 +1,197 @@
+# bot/multiproc.py
+import asyncio
+import multiprocessing as mp
+import signal
+import time
+from queue import Empty
+from typing import Dict, Optional
+
+from bot.config import REPORT_INTERVAL
+from bot.metrics import recorder, MetricsReporter, LatencyHistogram, print_window
+
+
+def _slice_options(options: Dict, index: int, processes: int) -> Dict:
+    """목표 TPS / 동시 요청 수를 프로세스 수로 나눔"""
+    sliced = dict(options)
+    for key in ("rate", "end_rate", "step_rate", "rate_limit"):
+        if sliced.get(key) is not None:
+            sliced[key] = sliced[key] / processes
+
+    sliced["rate_scale"] = 1 / processes
+    sliced["concurrency"] = max(1, options["concurrency"] // processes)
+    if options.get("seed") is not None:
+        sliced["seed"] = options["seed"] + index
+    return sliced
+
+
+async def _run_child(options: Dict, stop, lag):
+    from bot.async_worker import run_engine, run_open_loop
+    from bot.lifecycle import Lifecycle
+    from bot.order import create_order
+    from bot.pacing import build_pacer
+
+    pacer = build_pacer(options.get("rate_limit"), options.get("adaptive", False), options["concurrency"])
+    lifecycle = Lifecycle()
+
+    order_source = create_order
+    if options.get("pregen"):
+        from bot.config import COINS
+        from bot.order_stream import OrderStream
+        from bot.price_stream import start_price_feed
+
+        start_price_feed(COINS)
+        order_source = OrderStream(seed=options.get("seed")).start()
+
+    if options.get("scenario"):
+        from bot.scenario import load_scenario
+
+        scenario = load_scenario(options["scenario"], scale=options["rate_scale"], seed=options.get("seed"))
+        engine = run_open_loop(
+            scenario, options["duration"] or scenario.duration, options["concurrency"],
+            order_source=scenario.order_source, lag=lag, pacer=pacer, lifecycle=lifecycle
+        )
+    elif options["mode"] == "open":
+        from bot.load_profile import build_profile
+
+        profile = build_profile(
+            options["profile"],
+            options["rate"],
+            options["duration"],
+            end_rate=options.get("end_rate"),
+            step_rate=options.get("step_rate"),
+            step_every=options.get("step_every", 10.0),
+            seed=options.get("seed")
+        )
+        engine = run_open_loop(
+            profile, options["duration"], options["concurrency"],
+            order_source=order_source, lag=lag, pacer=pacer, lifecycle=lifecycle
+        )
+    else:
+        engine = run_engine(options["concurrency"], options.get("duration"), order_source, pacer, lifecycle)
+
+    task = asyncio.create_task(engine)
+
+    # 부모의 종료 신호(stop) 감시
+    while not task.done():
+        if stop.is_set():
+            task.cancel()
+            break
+        await asyncio.sleep(0.2)
+
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def _child_main(index: int, options: Dict, results, stop):
+    # Ctrl-C 는 부모가 받아서 stop 으로 전달
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from bot.async_worker import ScheduleLag
+
+    lag = ScheduleLag()
+
+    def send_window(window: LatencyHistogram, ok: int, ng: int, elapsed: float):
+        results.put(("window", index, window.to_dict(), ok, ng, elapsed))
+
+    reporter = MetricsReporter(recorder, REPORT_INTERVAL, sink=send_window)
+    reporter.start()
+
+    try:
+        asyncio.run(_run_child(options, stop, lag))
+    finally:
+        reporter.stop()
+        results.put(("final", index, recorder.export(), lag.to_dict()))
+
+
+def start_multiprocess(processes: int, options: Dict):
+    """
+    N개 프로세스로 부하 분산 (프로세스마다 asyncio 엔진 + 목표 TPS 의 1/N)
+    각 프로세스의 카운터 / 히스토그램을 부모에서 합쳐 하나의 리포트로 출력
+
+    :param options: mode(open|async), concurrency, duration, pregen, seed,
+                    profile, rate, end_rate, step_rate, step_every, scenario,
+                    rate_limit, adaptive
+    """
+    from bot.async_worker import ScheduleLag
+    from bot.worker import print_summary
+
+    print(f"\n🚀 BOT 멀티 프로세스 시작: {processes}개 × {options['mode']} 엔진")
+
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    stop = ctx.Event()
+
+    children = [
+        ctx.Process(
+            target=_child_main,
+            args=(i, _slice_options(options, i, processes), results, stop),
+            name=f"BOT-PROC-{i}",
+            daemon=True
+        )
+        for i in range(processes)
+    ]
+
+    start_time = time.time()
+    for p in children:
+        p.start()
+
+    lag = ScheduleLag()
+    finished = set()
+    measured = []
+    window: Optional[LatencyHistogram] = None
+    window_ok = window_ng = 0
+    next_print = time.monotonic() + REPORT_INTERVAL
+
+    def collect(timeout: float):
+        nonlocal window, window_ok, window_ng
+        try:
+            msg = results.get(timeout=timeout)
+        except Empty:
+            return
+
+        if msg[0] == "window":
+            _, _, hist_data, ok, ng, _ = msg
+            if window is None:
+                window = LatencyHistogram()
+            window.merge(LatencyHistogram.from_dict(hist_data))
+            window_ok += ok
+            window_ng += ng
+        else:
+            _, index, export, lag_data = msg
+            recorder.merge_export(export)
+            if export.get("elapsed"):
+                measured.append(export["elapsed"])
+            lag.merge(lag_data)
+            finished.add(index)
+
+    try:
+        while len(finished) < processes:
+            collect(0.2)
+
+            if time.monotonic() >= next_print and window is not None:
+                print_window(window, window_ok, window_ng, REPORT_INTERVAL)
+                window, window_ok, window_ng = None, 0, 0
+                next_print += REPORT_INTERVAL
+
+            if all(not p.is_alive() for p in children) and results.empty():
+                break
+    except KeyboardInterrupt:
+        print("\n🛑 종료 신호 감지 → 자식 프로세스 정리 중")
+        stop.set()
+        deadline = time.time() + 30
+        while len(finished) < processes and time.time() < deadline:
+            collect(0.5)
+
+    for p in children:
+        p.join(timeout=5)
+
+    if len(finished) < processes:
+        print(f"⚠️ {processes - len(finished)}개 프로세스의 결과를 받지 못했습니다")
+
+    # 자식마다 워밍업 이후 측정 구간 길이 (프로세스 기동 / 워밍업 / 드레인 시간 제외)
+    elapsed = max(measured) if measured else time.time() - start_time
+    print_summary(elapsed)
+    if options["mode"] == "open":
+        lag.report(elapsed)
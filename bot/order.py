@@ -1,8 +1,9 @@
 # bot/order.py
 import random
-from typing import Optional, Dict
-from bot.config import COINS, CATEGORY_MAP, BOT_ID
-from bot.price import random_price
+from typing import Optional, Dict, Sequence
+from bot.config import COINS, CATEGORY_MAP, BOT_ID, PRICE_MODEL
+from bot.price import random_price, format_price
+from bot.book import book_model
 
 TOP_7_COINS = ['BTC', 'ETH', 'SOL', 'XRP', 'DOGE', 'ADA', 'DOT']
 
@@ -20,22 +21,39 @@ for c in COINS:
     else:
         COIN_WEIGHTS.append(other_weight)
 
-def create_order() -> Optional[Dict]:
-
-    coin = random.choices(COINS, weights=COIN_WEIGHTS, k=1)[0]
-    
-    price = random_price(coin)
+def create_order(
+    coin: Optional[str] = None,
+    base_price: Optional[float] = None,
+    weights: Optional[Sequence[float]] = None,
+    buy_ratio: float = 0.5
+) -> Optional[Dict]:
+    """
+    :param coin: 지정하지 않으면 가중치 랜덤 선택
+    :param base_price: 지정하면 그 가격 그대로 주문 (차트 프레임 주문용)
+    :param weights: COINS 순서의 코인 선택 가중치 (기본: COIN_WEIGHTS)
+    :param buy_ratio: BUY 주문 비율
+    """
+    if coin is None:
+        coin = random.choices(COINS, weights=weights or COIN_WEIGHTS, k=1)[0]
+
+    order_type = "BUY" if random.random() < buy_ratio else "SELL"
+    count = round(random.uniform(0.1, 3), 4)
+
+    if base_price is not None:
+        price = format_price(base_price)
+    elif PRICE_MODEL == "book":
+        price = book_model.order_price(coin, order_type, count)
+    else:
+        price = random_price(coin)
 
     if price is None:
         return None
 
-    order_type = random.choice(["BUY", "SELL"])
-
     return {
         "botId": BOT_ID,
         "categoryId": CATEGORY_MAP[coin],
         "orderPrice": price,
-        "orderCount": round(random.uniform(0.1, 3), 4),
+        "orderCount": count,
         "orderType": order_type,
         "_coin": coin
     }
\ No newline at end of file
@@ -0,0 +1,145 @@
+# bot/order_stream.py
+import random
+from collections import deque
+from threading import Thread, Event, Lock
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bot.config import COINS, CATEGORY_MAP, BOT_ID, PRICE_MODEL
+from bot.book import book_model
+from bot.order import COIN_WEIGHTS, create_order
+from bot.price import PRICE_CACHE, format_price
+
+SIM_FLOOR = 1.00
+# 블록이 비어서 나오면 (시세가 아직 없음) 이만큼 쉬었다가 다시 시도
+EMPTY_BACKOFF = 0.5  # seconds
+
+
+class OrderStream:
+    """
+    주문 미리 생성기 (create_order() 대체용)
+
+    - NumPy 로 block_size 개씩 코인(가중치)/BUY·SELL/수량/가격 변동률을 한 번에 샘플링
+    - 링 버퍼(deque)에 쌓아두고 송신 쪽은 꺼내 쓰기만 함
+    - 버퍼가 low_water 아래로 내려가면 백그라운드 스레드가 다음 블록을 채움
+      → 주문 생성 비용이 측정 지연시간에서 빠짐
+    - 버퍼가 비면 송신 쪽은 create_order() 한 건으로 대신함 (블록 생성은 항상 리필 스레드 몫)
+    - seed 를 주면 코인/방향/수량/변동률 순서가 재현됨
+      (기준가는 블록 생성 시점의 PRICE_CACHE 값)
+    """
+
+    def __init__(
+        self,
+        coins: Sequence[str] = COINS,
+        weights: Sequence[float] = COIN_WEIGHTS,
+        block_size: int = 4096,
+        capacity_blocks: int = 4,
+        seed: Optional[int] = None
+    ):
+        self.coins = list(coins)
+        self.category_ids = [CATEGORY_MAP[c] for c in self.coins]
+        weights = np.asarray(weights, dtype=float)
+        self.weights = weights / weights.sum() if weights.sum() > 0 else None
+        # 언더런 시 송신 스레드에서 쓰는 가중치 (NumPy rng 는 리필 스레드 전용)
+        self.fallback_weights = self.weights.tolist() if self.weights is not None else None
+
+        self.block_size = block_size
+        self.low_water = block_size * (capacity_blocks - 1)
+        self.rng = np.random.default_rng(seed)
+
+        self.buffer: deque = deque()
+        self.generated = 0
+        self.underruns = 0
+
+        self._fill_lock = Lock()
+        self._need_refill = Event()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    def _generate_block(self) -> List[Dict]:
+        n = self.block_size
+        rng = self.rng
+
+        coin_idx = rng.choice(len(self.coins), size=n, p=self.weights)
+        is_buy = rng.random(n) < 0.5
+        counts = np.round(rng.uniform(0.1, 3, n), 4)
+        change = rng.uniform(-0.05, 0.05, n)
+
+        # 블록 생성 시점의 시세 스냅샷 (시세 없는 코인은 NaN → 건너뜀)
+        base = np.array([PRICE_CACHE.get(c, (np.nan, 0))[0] for c in self.coins], dtype=float)
+        prices = np.maximum(np.maximum(base, SIM_FLOOR)[coin_idx] * (1 + change), 0.01)
+
+        orders = []
+        for i, buy, count, price in zip(coin_idx.tolist(), is_buy.tolist(), counts.tolist(), prices.tolist()):
+            if price != price:  # NaN
+                continue
+
+            order_type = "BUY" if buy else "SELL"
+            if PRICE_MODEL == "book":
+                # 호가창 상태는 주문 순서에 따라 바뀌므로 한 건씩 (리필 스레드에서 처리)
+                price = book_model.order_price(self.coins[i], order_type, count, base[i])
+            else:
+                price = format_price(price)
+
+            orders.append({
+                "botId": BOT_ID,
+                "categoryId": self.category_ids[i],
+                "orderPrice": price,
+                "orderCount": count,
+                "orderType": order_type,
+                "_coin": self.coins[i]
+            })
+
+        self.generated += len(orders)
+        return orders
+
+    def _fill(self) -> int:
+        with self._fill_lock:
+            orders = self._generate_block()
+            self.buffer.extend(orders)
+        return len(orders)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._need_refill.wait(0.5)
+            self._need_refill.clear()
+
+            while len(self.buffer) < self.low_water and not self._stopped.is_set():
+                if not self._fill():
+                    # 시세가 없어 한 건도 못 만듦 → 바쁜 대기 대신 잠시 쉼
+                    self._stopped.wait(EMPTY_BACKOFF)
+                    break
+
+    def start(self) -> "OrderStream":
+        for _ in range(self.low_water // self.block_size + 1):
+            if not self._fill():
+                print("⚠️ 시세가 없어 주문을 미리 만들지 못했습니다 (시세가 들어오는 대로 리필)")
+                break
+
+        self._thread = Thread(target=self._run, name="ORDER-STREAM", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._need_refill.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def next(self) -> Optional[Dict]:
+        try:
+            order = self.buffer.popleft()
+        except IndexError:
+            # 리필이 소비 속도를 못 따라감 → 리필을 깨우고 이번 주문은 한 건만 바로 생성
+            self.underruns += 1
+            self._need_refill.set()
+            coin = random.choices(self.coins, weights=self.fallback_weights, k=1)[0]
+            return create_order(coin=coin)
+
+        if len(self.buffer) < self.low_water and not self._need_refill.is_set():
+            self._need_refill.set()
+        return order
+
+    # create_order 자리에 그대로 넘길 수 있도록
+    __call__ = next
@@ -0,0 +1,210 @@
+# bot/pacing.py
+"""
+주문 송신 페이싱
+
+- TokenBucket : 전체 송신 속도 상한 (초당 rate, 최대 burst 개 몰아서)
+- AimdLimiter : 백엔드 상태에 따라 동시 요청 한도를 조절 (AIMD)
+                429/502/503/504/타임아웃 또는 지연시간 급증 → 곱셈 감소
+                정상 응답 → 한도당 +1 (RTT 한 번에 1 정도) 가산 증가
+- Pacer       : 둘을 묶어 엔진(thread / async / open)에 끼우는 단위
+  (최대 지속 가능 처리량 탐색은 bot/benchmark.py 의 find_max_tps)
+"""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+# 수집기(src/common)와 같은 Retry-After 파서 (초 / HTTP-date 둘 다)
+from src.common.rate_limiter import parse_retry_after
+
+# 백엔드 과부하 신호로 보는 응답
+OVERLOAD_STATUS = {"429", "502", "503", "504", "error"}
+
+
+class TokenBucket:
+    """
+    예약형 토큰 버킷 (스레드 안전)
+    reserve() 는 토큰을 먼저 가져가고 기다려야 할 시간만 돌려줌
+    → 스레드는 time.sleep, 코루틴은 asyncio.sleep 으로 같은 버킷 공유
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate / 10, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """토큰 1개 예약 → 기다려야 할 시간(초)"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.paused_until - now, 0.0)
+        return wait
+
+    def try_acquire(self) -> bool:
+        """기다리지 않고 토큰이 있을 때만 가져감 (오픈 루프용)"""
+        with self.lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return False
+            self._refill(now)
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def pause(self, seconds: float):
+        """Retry-After 동안 송신 중단"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class AimdLimiter:
+    """
+    적응형 동시 요청 한도
+
+    - 과부하 신호: OVERLOAD_STATUS 응답, latency_target 초과,
+      또는 지연시간 EWMA 가 지금까지 가장 낮았던 EWMA 의 latency_ratio 배 초과
+    - 감소는 cooldown 초에 한 번만 (한 번의 혼잡에 연속으로 깎이지 않도록)
+    """
+
+    EWMA_ALPHA = 0.1
+    # 이보다 빠른 응답은 지연시간 신호로 보지 않음 (수 ms 단위 지터로 한도가 깎이지 않도록)
+    LATENCY_FLOOR = 0.005
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        backoff: float = 0.5,
+        latency_ratio: float = 2.0,
+        latency_target: Optional[float] = None,
+        cooldown: float = 1.0
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit or initial
+        self.backoff = backoff
+        self.latency_ratio = latency_ratio
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+
+        self.ewma: Optional[float] = None
+        self.best_ewma: Optional[float] = None
+        self.last_decrease = 0.0
+        self.decreases = 0
+        self.min_seen = float(initial)
+        self.lock = threading.Lock()
+
+    def _latency_high(self, latency: float) -> bool:
+        self.ewma = latency if self.ewma is None else self.ewma + self.EWMA_ALPHA * (latency - self.ewma)
+        if self.best_ewma is None or self.ewma < self.best_ewma:
+            self.best_ewma = self.ewma
+
+        if self.ewma < self.LATENCY_FLOOR:
+            return False
+        if self.latency_target is not None and self.ewma > self.latency_target:
+            return True
+        return self.ewma > self.best_ewma * self.latency_ratio
+
+    def on_response(self, status: str, latency: float):
+        with self.lock:
+            overloaded = status in OVERLOAD_STATUS or self._latency_high(latency)
+
+            if overloaded:
+                now = time.monotonic()
+                if now - self.last_decrease >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self.min_seen = min(self.min_seen, self.limit)
+                    self.last_decrease = now
+                    self.decreases += 1
+            elif status == "200":
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+
+class Pacer:
+    """
+    엔진에 끼우는 페이싱 단위 (bucket / limiter 둘 다 선택)
+
+    - closed loop: 워커 index 가 limiter 한도 이상이면 쉬고, 송신 전 bucket 대기
+    - open loop  : 토큰이 없거나 in-flight 가 한도 이상이면 드롭 (스케줄은 밀지 않음)
+    """
+
+    IDLE_SLEEP = 0.05
+
+    def __init__(self, bucket: Optional[TokenBucket] = None, limiter: Optional[AimdLimiter] = None):
+        self.bucket = bucket
+        self.limiter = limiter
+        self.throttled = 0
+        self.waited = 0.0
+
+    def allows(self, index: int) -> bool:
+        return self.limiter is None or index < self.limiter.current
+
+    def reserve(self) -> float:
+        if self.bucket is None:
+            return 0.0
+        wait = self.bucket.reserve()
+        self.waited += wait
+        return wait
+
+    def wait(self):
+        """스레드 엔진: 토큰이 생길 때까지 블로킹"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def admit(self, inflight: int) -> bool:
+        """오픈 루프: 지금 발사해도 되는지 (안 되면 드롭)"""
+        if self.limiter is not None and inflight >= self.limiter.current:
+            return False
+        return self.bucket is None or self.bucket.try_acquire()
+
+    def on_response(self, status: str, latency: float, retry_after: Optional[str] = None):
+        if status in ("429", "503"):
+            self.throttled += 1
+            wait = parse_retry_after(retry_after)
+            if wait is not None and self.bucket is not None:
+                self.bucket.pause(wait)
+
+        if self.limiter is not None:
+            self.limiter.on_response(status, latency)
+
+    def summary(self) -> str:
+        parts = [f"429/503 응답 {self.throttled}건"]
+        if self.bucket is not None:
+            parts.append(f"토큰 버킷 {self.bucket.rate:.0f} TPS (누적 대기 {self.waited:.1f}s)")
+        if self.limiter is not None:
+            parts.append(
+                f"동시 한도 {self.limiter.current} (최저 {int(self.limiter.min_seen)}, "
+                f"감소 {self.limiter.decreases}회)"
+            )
+        return " | ".join(parts)
+
+
+def build_pacer(rate_limit: Optional[float], adaptive: bool, concurrency: int) -> Optional[Pacer]:
+    """run_bot.py 인자 → Pacer (둘 다 꺼져 있으면 None)"""
+    bucket = TokenBucket(rate_limit) if rate_limit else None
+    limiter = AimdLimiter(concurrency) if adaptive else None
+
+    if bucket is None and limiter is None:
+        return None
+    return Pacer(bucket, limiter)
@@ -2,15 +2,30 @@
 import random
 import time
 import requests
-from typing import Optional, Dict, Tuple
+from threading import Thread, Event, Lock
+from typing import Optional, Dict, Tuple, Iterable
 
-UPBIT_MARKET_URL = "https://api.upbit.com/v1/market/all"
-UPBIT_TICKER_URL = "https://api.upbit.com/v1/ticker"
+from bot.config import UPBIT_API_URL
+
+UPBIT_MARKET_URL = f"{UPBIT_API_URL}/v1/market/all"
+UPBIT_TICKER_URL = f"{UPBIT_API_URL}/v1/ticker"
 
 # ===== 캐시 설정 =====
 PRICE_TTL = 60.0  # seconds
 PRICE_CACHE: Dict[str, Tuple[float, float]] = {}
 
+# TTL 이 지나도 이 시간까지는 이전 값을 쓰면서 백그라운드 갱신 (stale-while-revalidate)
+PRICE_STALE_LIMIT = 600.0  # seconds
+# 백그라운드 갱신 주기 (TTL 만료 전에 미리 갱신)
+REFRESH_INTERVAL = PRICE_TTL / 3
+
+# 시세가 없는 코인(KRW 미상장 등)은 이 시간 동안 다시 조회하지 않음 (negative cache)
+PRICE_MISS_TTL = 60.0  # seconds
+_PRICE_MISSES: Dict[str, float] = {}
+
+# ticker API 1회 요청당 마켓 수
+TICKER_CHUNK = 100
+
 # KRW 마켓 캐시
 _KRW_MARKETS = None
 
@@ -32,44 +47,199 @@ def load_krw_markets():
     return _KRW_MARKETS
 
 
-def fetch_upbit_price(coin: str) -> Optional[float]:
-
-    time.sleep(0.1)
+def fetch_upbit_price(coins: Iterable[str]) -> Dict[str, float]:
+    """
+    여러 코인 시세를 한 번에 조회 (ticker API 는 markets 를 콤마로 여러 개 받음)
+    → N개 코인 = 1회 왕복 (TICKER_CHUNK 개 단위로 나눠서 요청)
 
+    :return: {coin: trade_price} (KRW 마켓에 없는 코인은 제외)
+    """
     krw_markets = load_krw_markets()
+    targets = [c for c in dict.fromkeys(coins) if c in krw_markets]
 
-    if coin not in krw_markets:
-        return None
+    prices: Dict[str, float] = {}
+    for i in range(0, len(targets), TICKER_CHUNK):
+        chunk = targets[i:i + TICKER_CHUNK]
 
-    res = requests.get(
-        UPBIT_TICKER_URL,
-        params={"markets": f"KRW-{coin}"},
-        timeout=2
-    )
+        res = requests.get(
+            UPBIT_TICKER_URL,
+            params={"markets": ",".join(f"KRW-{c}" for c in chunk)},
+            timeout=2
+        )
 
-    if res.status_code != 200:
-        return None
+        if res.status_code != 200:
+            continue
 
-    return res.json()[0]["trade_price"]
+        for ticker in res.json():
+            prices[ticker["market"].replace("KRW-", "")] = ticker["trade_price"]
 
+    return prices
 
-def get_cached_price(coin: str) -> Optional[float]:
+
+def refresh_prices(coins: Iterable[str]) -> Dict[str, float]:
+    """TTL과 무관하게 coins 시세를 한 번에 다시 받아 캐시를 갱신"""
+    coins = list(coins)
+    prices = fetch_upbit_price(coins)
     now = time.time()
 
-    # 1️⃣ 캐시 hit
-    if coin in PRICE_CACHE:
-        price, timestamp = PRICE_CACHE[coin]
-        if now - timestamp < PRICE_TTL:
+    # 새 값을 다 만든 뒤 dict.update 한 번으로 교체
+    # → 다른 스레드가 일부 코인만 갱신된 중간 상태를 보지 않음
+    PRICE_CACHE.update({coin: (price, now) for coin, price in prices.items()})
+
+    # 응답에 없던 코인은 miss 로 기록 → PRICE_MISS_TTL 동안 주문마다 다시 조회하지 않음
+    _PRICE_MISSES.update({coin: now for coin in coins if coin not in prices})
+    for coin in prices:
+        _PRICE_MISSES.pop(coin, None)
+    return prices
+
+
+def _recently_missed(coin: str) -> bool:
+    missed_at = _PRICE_MISSES.get(coin)
+    return missed_at is not None and time.time() - missed_at < PRICE_MISS_TTL
+
+
+# ===== 단일 요청 (single-flight) =====
+# 같은 코인 miss 가 동시에 나도 업비트 호출은 1번, 나머지는 결과를 기다림
+_INFLIGHT: Dict[str, Event] = {}
+_INFLIGHT_LOCK = Lock()
+
+
+def _single_flight_refresh(coin: str):
+    with _INFLIGHT_LOCK:
+        done = _INFLIGHT.get(coin)
+        leader = done is None
+        if leader:
+            done = _INFLIGHT[coin] = Event()
+
+    if not leader:
+        done.wait(timeout=5)
+        return
+
+    try:
+        # 같이 캐시된 코인들도 거의 같은 시점에 만료되므로 한 번에 갱신
+        refresh_prices([coin, *list(PRICE_CACHE)])
+    except Exception as e:
+        print(f"⚠️ 시세 갱신 실패 ({coin}): {e}")
+        _PRICE_MISSES[coin] = time.time()
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(coin, None)
+        done.set()
+
+
+class PriceRefresher(Thread):
+    """
+    백그라운드 시세 갱신 스레드
+    - interval 마다 등록된 코인 전체를 한 번에 갱신
+    - request() 로 stale 코인 갱신을 앞당김
+    """
+
+    def __init__(self, coins: Iterable[str], interval: float):
+        super().__init__(name="PRICE-REFRESHER", daemon=True)
+        self.coins = set(coins)
+        self.pending = set()
+        self.lock = Lock()  # coins / pending 은 주문 스레드들과 공유
+        self.interval = interval
+        self.wake = Event()
+        self.stopped = Event()
+
+    def request(self, coin: str):
+        with self.lock:
+            self.pending.add(coin)
+        self.wake.set()
+
+    def add(self, coins: Iterable[str]):
+        with self.lock:
+            self.coins.update(coins)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+            if self.stopped.is_set():
+                break
+
+            with self.lock:
+                pending, self.pending = self.pending, set()
+                self.coins |= pending
+                coins = list(self.coins)
+
+            try:
+                refresh_prices(coins)
+            except Exception as e:
+                print(f"⚠️ 시세 백그라운드 갱신 실패: {e}")
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+        self.join()
+
+
+_refresher: Optional[PriceRefresher] = None
+
+
+def start_price_refresher(coins: Iterable[str], interval: float = REFRESH_INTERVAL) -> PriceRefresher:
+    """
+    시세 캐시 워밍업(동기 1회) 후 백그라운드 갱신 시작
+    → 이후 random_price() 는 네트워크를 기다리지 않음
+    """
+    global _refresher
+
+    coins = list(coins)
+    if _refresher is None or not _refresher.is_alive():
+        try:
+            refresh_prices(coins)
+        except Exception as e:
+            print(f"⚠️ 시세 워밍업 실패: {e}")
+
+        _refresher = PriceRefresher(coins, interval)
+        _refresher.start()
+    else:
+        _refresher.add(coins)
+
+    return _refresher
+
+
+def stop_price_refresher():
+    global _refresher
+
+    if _refresher is not None:
+        _refresher.stop()
+        _refresher = None
+
+
+def _revalidate(coin: str):
+    if _refresher is not None:
+        _refresher.request(coin)
+    elif coin not in _INFLIGHT:
+        Thread(target=_single_flight_refresh, args=(coin,), daemon=True).start()
+
+
+def get_cached_price(coin: str) -> Optional[float]:
+    entry = PRICE_CACHE.get(coin)
+
+    if entry is not None:
+        price, timestamp = entry
+        age = time.time() - timestamp
+
+        # 1️⃣ 캐시 hit
+        if age < PRICE_TTL:
             return price
 
-    # 2️⃣ 캐시 miss → 업비트 호출
-    price = fetch_upbit_price(coin)
+        # 2️⃣ stale → 이전 값을 그대로 쓰고 갱신은 백그라운드에서
+        if age < PRICE_STALE_LIMIT:
+            _revalidate(coin)
+            return price
 
-    if price is None:
+    # 3️⃣ 최근에 조회했는데 시세가 없던 코인 → 바로 None (네트워크 호출 X)
+    if _recently_missed(coin):
         return None
 
-    PRICE_CACHE[coin] = (price, now)
-    return price
+    # 4️⃣ 캐시 없음 (또는 너무 오래됨) → 갱신은 백그라운드에 맡기고 이번 주문은 None
+    #    (create_order 가 이벤트 루프 위에서 돌기도 하므로 여기서는 절대 네트워크를 기다리지 않음)
+    _revalidate(coin)
+    return None
 
 
 def format_price(price: float):
@@ -90,6 +260,20 @@ def format_price(price: float):
         return round(price, 2)
 
 
+def tick_size(price: float) -> float:
+    """format_price 와 같은 구간의 호가 단위"""
+    if price >= 1_000_000:
+        return 1000
+    elif price >= 100_000:
+        return 100
+    elif price >= 100:
+        return 1
+    elif price >= 10:
+        return 0.1
+    else:
+        return 0.01
+
+
 def random_price(coin: str) -> Optional[float]:
     base_price = get_cached_price(coin)
 
@@ -0,0 +1,193 @@
+# bot/price_stream.py
+import asyncio
+import json
+import random
+import time
+import uuid
+from threading import Thread, Event
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import websockets
+
+from bot.config import UPBIT_WS_URL, PRICE_SOURCE
+from bot.interpolator import SmoothPriceInterpolator, VectorizedPriceInterpolator
+from bot.price import PRICE_CACHE, start_price_refresher
+
+FramesCallback = Callable[[str, List[float]], None]
+Interpolator = Union[SmoothPriceInterpolator, VectorizedPriceInterpolator]
+
+
+class UpbitPriceStream:
+    """
+    업비트 WebSocket ticker 스트림 → 메모리 시세 테이블
+
+    - 체결가가 들어올 때마다 PRICE_CACHE 갱신 (REST 폴링 불필요)
+    - 틱을 FRAME_BATCH_WINDOW 동안 모아서 한 번에 차트 프레임 생성 → on_frames 로 전달
+      (VectorizedPriceInterpolator 면 smooth_many() 한 번으로 전체 마켓 계산)
+      배치 안에 같은 코인이 다시 오면 먼저 모은 것부터 처리 → 틱 순서 / 개수 그대로
+    - 연결이 끊기면 지수 백오프(+지터)로 재접속
+    - record_path 를 주면 수신 메시지를 JSONL 로 저장 (replay_server 로 재생 가능)
+    """
+
+    BACKOFF_MIN = 1.0
+    BACKOFF_MAX = 30.0
+    FRAME_BATCH_WINDOW = 0.01  # seconds
+
+    def __init__(
+        self,
+        coins: Iterable[str],
+        url: str = UPBIT_WS_URL,
+        interpolator: Optional[Interpolator] = None,
+        on_frames: Optional[FramesCallback] = None,
+        record_path: Optional[str] = None
+    ):
+        self.coins = list(coins)
+        self.url = url
+        self.interpolator = interpolator
+        self.on_frames = on_frames
+        self.record_path = record_path
+
+        self.prices: Dict[str, float] = {}
+        self.batch: Dict[str, float] = {}  # 아직 프레임을 만들지 않은 틱 (코인 → 체결가)
+        self.batch_started = 0.0
+        self.ticks = 0
+        self.reconnects = 0
+        self.stopped = Event()
+
+    def _subscribe_message(self) -> str:
+        return json.dumps([
+            {"ticket": str(uuid.uuid4())},
+            {"type": "ticker", "codes": [f"KRW-{c}" for c in self.coins]},
+        ])
+
+    def _handle(self, raw):
+        data = json.loads(raw)
+
+        code = data.get("code") or data.get("cd")
+        price = data.get("trade_price") or data.get("tp")
+        if not code or price is None:
+            return
+
+        coin = code.replace("KRW-", "")
+        self.prices[coin] = price
+        PRICE_CACHE[coin] = (price, time.time())
+        self.ticks += 1
+
+        if self.interpolator is not None:
+            if coin in self.batch:
+                self.flush_frames()
+            if not self.batch:
+                self.batch_started = time.monotonic()
+            self.batch[coin] = price
+
+    def flush_frames(self):
+        """모아 둔 틱 → 차트 프레임 (마켓 전체를 한 번에)"""
+        if not self.batch:
+            return
+        coins, prices = list(self.batch), list(self.batch.values())
+        self.batch = {}
+
+        if isinstance(self.interpolator, VectorizedPriceInterpolator):
+            frames = self.interpolator.smooth_many(coins, prices)
+        else:
+            frames = {coin: self.interpolator.smooth(coin, price) for coin, price in zip(coins, prices)}
+
+        if self.on_frames is not None:
+            for coin in coins:
+                self.on_frames(coin, frames[coin])
+
+    async def _receive(self, ws):
+        """다음 메시지 (모아 둔 틱이 있으면 배치 시간까지만 기다리고 None)"""
+        if not self.batch:
+            return await ws.recv()
+
+        remaining = self.batch_started + self.FRAME_BATCH_WINDOW - time.monotonic()
+        try:
+            return await asyncio.wait_for(ws.recv(), max(remaining, 0.0))
+        except asyncio.TimeoutError:
+            return None
+
+    async def run(self):
+        backoff = self.BACKOFF_MIN
+        record = open(self.record_path, "a", encoding="utf-8") if self.record_path else None
+
+        try:
+            while not self.stopped.is_set():
+                try:
+                    async with websockets.connect(self.url, ping_interval=20, max_size=2 ** 20) as ws:
+                        await ws.send(self._subscribe_message())
+                        print(f"📡 시세 스트림 연결: {self.url} ({len(self.coins)}개 코인)")
+
+                        while not self.stopped.is_set():
+                            try:
+                                raw = await self._receive(ws)
+                            except websockets.ConnectionClosedOK:
+                                self.flush_frames()
+                                break
+
+                            if raw is None or time.monotonic() - self.batch_started >= self.FRAME_BATCH_WINDOW:
+                                self.flush_frames()
+                            if raw is None:
+                                continue
+
+                            if record is not None:
+                                text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+                                record.write(json.dumps({"t": time.time(), "msg": json.loads(text)}) + "\n")
+
+                            self._handle(raw)
+                            backoff = self.BACKOFF_MIN
+
+                except Exception as e:
+                    self.flush_frames()
+                    if self.stopped.is_set():
+                        break
+                    self.reconnects += 1
+                    delay = backoff * random.uniform(0.5, 1.0)
+                    print(f"⚠️ 시세 스트림 끊김 ({e!r}) → {delay:.1f}초 후 재접속")
+                    await asyncio.sleep(delay)
+                    backoff = min(backoff * 2, self.BACKOFF_MAX)
+        finally:
+            if record is not None:
+                record.close()
+
+    def start_in_thread(self) -> Thread:
+        """스레드 엔진용: 별도 이벤트 루프에서 스트림 실행"""
+        thread = Thread(target=lambda: asyncio.run(self.run()), name="PRICE-STREAM", daemon=True)
+        thread.start()
+        return thread
+
+    def wait_ready(self, timeout: float = 5.0) -> bool:
+        """모든 코인의 첫 시세가 들어올 때까지 대기"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all(c in self.prices for c in self.coins):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def stop(self):
+        self.stopped.set()
+
+
+_stream: Optional[UpbitPriceStream] = None
+
+
+def start_price_feed(coins: Iterable[str], **stream_kwargs) -> Optional[UpbitPriceStream]:
+    """
+    PRICE_SOURCE 설정에 따라 시세 공급 시작 (이미 시작됐으면 그대로 사용)
+    - rest: 배치 REST 백그라운드 갱신 (기본)
+    - ws  : WebSocket 스트림 (REST 폴링 없음)
+    """
+    global _stream
+    coins = list(coins)
+
+    if PRICE_SOURCE != "ws":
+        start_price_refresher(coins)
+        return None
+
+    if _stream is None:
+        _stream = UpbitPriceStream(coins, **stream_kwargs)
+        _stream.start_in_thread()
+        if not _stream.wait_ready():
+            print("⚠️ 일부 코인의 첫 시세를 아직 받지 못했습니다 (수신되는 대로 반영)")
+    return _stream
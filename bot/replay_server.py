@@ -0,0 +1,125 @@
+# bot/replay_server.py
+"""
+업비트 WebSocket ticker 로컬 재생 서버 (오프라인 테스트용)
+
+    # UpbitPriceStream(record_path=...) 로 저장한 JSONL 재생
+    python -m bot.replay_server --file ticks.jsonl --speed 2.0
+
+    # 파일 없이 랜덤 워크 시세 생성
+    python -m bot.replay_server --tps 20
+
+봇 쪽은 UPBIT_WS_URL=ws://localhost:8765 로 접속
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List, Optional
+
+import websockets
+
+
+def _subscribed_codes(raw) -> List[str]:
+    for item in json.loads(raw):
+        if isinstance(item, dict) and item.get("type") == "ticker":
+            return item.get("codes", [])
+    return []
+
+
+def _ticker(code: str, price: float) -> bytes:
+    # 업비트와 동일하게 바이너리 프레임으로 전송
+    return json.dumps({
+        "type": "ticker",
+        "code": code,
+        "trade_price": price,
+        "timestamp": int(time.time() * 1000),
+        "stream_type": "REALTIME"
+    }).encode("utf-8")
+
+
+async def replay_file(ws, codes: List[str], path: str, speed: float, loop: bool):
+    """기록된 틱을 원래 간격(/speed)대로 재생"""
+    wanted = set(codes)
+
+    while True:
+        first_t = None
+        started = time.monotonic()
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                msg = record["msg"]
+                code = msg.get("code") or msg.get("cd")
+                if wanted and code not in wanted:
+                    continue
+
+                if first_t is None:
+                    first_t = record["t"]
+
+                delay = (record["t"] - first_t) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                price = msg.get("trade_price") or msg.get("tp")
+                await ws.send(_ticker(code, price))
+
+        if not loop:
+            return
+
+
+async def random_walk(ws, codes: List[str], tps: float, base: float):
+    """코인별 랜덤 워크 시세를 초당 tps 회 전송"""
+    prices = {code: base * random.uniform(0.5, 2.0) for code in codes}
+
+    # 접속 직후 스냅샷 (업비트도 구독 즉시 현재가를 한 번 보냄)
+    for code, price in prices.items():
+        await ws.send(_ticker(code, round(price, 2)))
+
+    while codes:
+        await asyncio.sleep(1.0 / tps)
+        code = random.choice(codes)
+        prices[code] *= 1 + random.gauss(0, 0.001)
+        await ws.send(_ticker(code, round(prices[code], 2)))
+
+
+def make_handler(path: Optional[str], speed: float, loop: bool, tps: float, base: float):
+    async def handler(ws):
+        codes = _subscribed_codes(await ws.recv())
+        print(f"🔌 클라이언트 구독: {len(codes)}개 마켓")
+
+        try:
+            if path:
+                await replay_file(ws, codes, path, speed, loop)
+            else:
+                await random_walk(ws, codes, tps, base)
+        except websockets.ConnectionClosed:
+            pass
+
+    return handler
+
+
+async def serve(host: str, port: int, **kwargs):
+    async with websockets.serve(make_handler(**kwargs), host, port):
+        print(f"▶️ 시세 재생 서버 가동: ws://{host}:{port}")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업비트 ticker WebSocket 재생 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--file", default=None, help="재생할 JSONL (없으면 랜덤 워크)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속")
+    parser.add_argument("--loop", action="store_true", help="파일 끝에서 처음부터 반복")
+    parser.add_argument("--tps", type=float, default=10.0, help="랜덤 워크 초당 틱 수")
+    parser.add_argument("--base", type=float, default=10_000.0, help="랜덤 워크 기준 가격")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(
+            args.host, args.port,
+            path=args.file, speed=args.speed, loop=args.loop, tps=args.tps, base=args.base
+        ))
+    except KeyboardInterrupt:
+        print("\n🛑 재생 서버 종료")
@@ -0,0 +1,259 @@
+# bot/scenario.py
+"""
+시나리오 파일(YAML / JSON) 기반 부하 재생
+
+    python run_bot.py --scenario bot/scenarios/market_open.yaml
+
+    name: market-open
+    poisson: false
+    defaults:
+      buy_ratio: 0.5
+    phases:
+      - name: calm
+        duration: 30
+        rate: 100                      # 고정 TPS
+      - name: open-spike
+        duration: 10
+        rate: {from: 100, to: 2000}    # 구간 동안 선형 증가
+      - name: btc-hotspot
+        duration: 30
+        rate: 1000
+        coins: {BTC: 0.9}              # 90% BTC, 나머지 10% 는 기본 가중치 비율대로
+        buy_ratio: 0.8                 # BUY 80%
+      - name: bursts
+        duration: 20
+        rate: 200
+        burst: {every: 5, size: 500, within: 0.1}   # 5초마다 0.1초 안에 500건 추가
+
+- 단계 경계 / 버스트 시작·끝 시각에 스케줄을 맞춰서 끊음 → 단계가 정확한 시각에 시작
+- 주문의 코인 / BUY·SELL 비율은 '발사 예정 시각'이 속한 단계 기준
+"""
+import bisect
+import json
+import math
+from typing import Dict, Iterator, List, Optional
+
+import yaml
+
+from bot.config import COINS
+from bot.load_profile import LoadProfile
+from bot.metrics import recorder
+from bot.order import COIN_WEIGHTS, create_order
+
+# 경계 비교 허용 오차 (부동소수 누적 오차로 경계 직전에 한 번 더 발사하지 않도록)
+EPS = 1e-6
+
+
+class Phase:
+    def __init__(
+        self,
+        name: str,
+        start: float,
+        duration: float,
+        rate: float,
+        end_rate: float,
+        weights: Optional[List[float]] = None,
+        buy_ratio: float = 0.5,
+        burst_every: float = 0.0,
+        burst_size: int = 0,
+        burst_within: float = 0.1
+    ):
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.end = start + duration
+        self.rate = rate
+        self.end_rate = end_rate
+        self.weights = weights
+        self.buy_ratio = buy_ratio
+        self.burst_every = burst_every
+        self.burst_size = burst_size
+        self.burst_within = burst_within
+
+    def rate_at(self, t: float) -> float:
+        """단계 시작 기준 t초 시점의 목표 TPS"""
+        rate = self.rate + (self.end_rate - self.rate) * t / self.duration
+        if self.burst_every and t % self.burst_every < self.burst_within:
+            rate += self.burst_size / self.burst_within
+        return rate
+
+    def next_change(self, t: float) -> float:
+        """t 이후 처음으로 목표 TPS 가 불연속적으로 바뀌는 시각 (단계 시작 기준)"""
+        changes = [self.duration]
+        if self.burst_every:
+            k = math.floor(t / self.burst_every)
+            changes += [k * self.burst_every + self.burst_within, (k + 1) * self.burst_every]
+        return min((c for c in changes if c > t + EPS), default=self.duration)
+
+    def describe(self) -> str:
+        rate = f"{self.rate:.0f}" if self.rate == self.end_rate else f"{self.rate:.0f} → {self.end_rate:.0f}"
+        text = f"{self.name} ({self.duration:.0f}s, {rate} TPS, BUY {self.buy_ratio:.0%}"
+        if self.burst_every:
+            text += f", {self.burst_every:.0f}s 마다 +{self.burst_size}건"
+        return text + ")"
+
+
+class Scenario(LoadProfile):
+    """
+    단계(Phase) 목록으로 이루어진 부하 프로파일 + 주문 생성기
+
+    - run_open_loop(scenario, ..., order_source=scenario.order_source) 로 재생
+    - scale: 모든 TPS 에 곱하는 배율 (멀티 프로세스에서 1/N)
+    """
+
+    def __init__(self, name: str, phases: List[Phase], scale: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.phases = phases
+        self.starts = [p.start for p in phases]
+        self.duration = phases[-1].end
+        self.scale = scale
+        self.current: Optional[Phase] = None
+
+    def phase_at(self, t: float) -> Phase:
+        index = bisect.bisect_right(self.starts, t) - 1
+        return self.phases[min(max(index, 0), len(self.phases) - 1)]
+
+    def rate_at(self, t: float) -> float:
+        if t >= self.duration:
+            return 0.0
+        phase = self.phase_at(t)
+        return phase.rate_at(t - phase.start) * self.scale
+
+    def next_change(self, t: float) -> float:
+        """시나리오가 끝난 뒤로는 바뀌는 시각이 없음 (math.inf)"""
+        if t >= self.duration - EPS:
+            return math.inf
+        phase = self.phase_at(t + EPS)
+        return phase.start + phase.next_change(t - phase.start)
+
+    def _enter(self, t: float):
+        phase = self.phase_at(t)
+        if phase is not self.current:
+            self.current = phase
+            recorder.log(f"🎬 [{t:.1f}s] 시나리오 단계: {phase.describe()}")
+
+    def arrivals(self, duration: float) -> Iterator[float]:
+        """
+        LoadProfile.arrivals 와 같지만 단계 경계 / 버스트 경계를 넘는 간격은 경계에서 끊음
+        → 고정 간격이면 경계 시각에 바로 발사, poisson 이면 경계에서 간격을 새로 뽑음
+        - duration 이 시나리오보다 길어도 시나리오 끝(self.duration)에서 종료
+        """
+        t = 0.0
+        fire = True
+        duration = min(duration, self.duration)
+
+        while t < duration:
+            rate = self.rate_at(t)
+            change = self.next_change(t)
+
+            if rate <= 0:
+                t, fire = change, True
+                continue
+
+            if fire:
+                self._enter(t)
+                yield t
+
+            step = self.rng.expovariate(rate) if self.poisson else 1.0 / rate
+            if t + step >= change - EPS:
+                t, fire = change, not self.poisson
+            else:
+                t, fire = t + step, True
+
+    def order_source(self) -> Optional[Dict]:
+        """
+        현재 단계의 코인 가중치 / BUY 비율로 주문 생성
+        run_open_loop 는 arrivals() 가 다음 시각을 내놓은 직후 이 함수를 부르므로
+        self.current 는 곧 발사할 주문의 예정 시각이 속한 단계
+        """
+        phase = self.current or self.phases[0]
+        return create_order(weights=phase.weights, buy_ratio=phase.buy_ratio)
+
+    def describe(self) -> str:
+        scale = f" ×{self.scale:g}" if self.scale != 1.0 else ""
+        return f"Scenario '{self.name}' {len(self.phases)}단계 {self.duration:.0f}s{scale}"
+
+
+def coin_weights(shares: Dict[str, float]) -> List[float]:
+    """
+    {코인: 비중} → COINS 순서의 가중치
+    지정한 코인은 그 비중 그대로, 남은 비중은 나머지 코인에 기본 가중치(COIN_WEIGHTS) 비율대로
+    """
+    shares = {coin.upper(): float(share) for coin, share in shares.items()}
+
+    unknown = [c for c in shares if c not in COINS]
+    if unknown:
+        print(f"⚠️ 시나리오의 코인 {unknown} 은(는) 활성 코인이 아니라 제외합니다")
+        shares = {c: s for c, s in shares.items() if c in COINS}
+
+    pinned = sum(shares.values())
+    if pinned > 1.0 + 1e-9:
+        raise ValueError(f"코인 비중 합이 1을 넘습니다: {pinned:.3f}")
+
+    rest_total = sum(w for c, w in zip(COINS, COIN_WEIGHTS) if c not in shares)
+    rest = (1.0 - pinned) / rest_total if rest_total > 0 else 0.0
+
+    return [shares[c] if c in shares else w * rest for c, w in zip(COINS, COIN_WEIGHTS)]
+
+
+def _parse_phase(spec: Dict, start: float, index: int) -> Phase:
+    name = spec.get("name", f"phase-{index + 1}")
+
+    duration = float(spec["duration"])
+    if duration <= 0:
+        raise ValueError(f"[{name}] duration 은 0보다 커야 합니다")
+
+    rate = spec.get("rate", 0)
+    if isinstance(rate, dict):
+        start_rate, end_rate = float(rate["from"]), float(rate["to"])
+    else:
+        start_rate = end_rate = float(rate)
+
+    buy_ratio = float(spec.get("buy_ratio", 0.5))
+    if not 0.0 <= buy_ratio <= 1.0:
+        raise ValueError(f"[{name}] buy_ratio 는 0~1 사이여야 합니다")
+
+    burst = spec.get("burst") or {}
+    burst_every = float(burst.get("every", 0))
+    burst_within = float(burst.get("within", 0.1))
+    if burst and not 0 < burst_within <= burst_every:
+        raise ValueError(f"[{name}] burst.within 은 0 < within ≤ every 여야 합니다")
+
+    return Phase(
+        name,
+        start,
+        duration,
+        start_rate,
+        end_rate,
+        weights=coin_weights(spec["coins"]) if spec.get("coins") else None,
+        buy_ratio=buy_ratio,
+        burst_every=burst_every,
+        burst_size=int(burst.get("size", 0)),
+        burst_within=burst_within
+    )
+
+
+def load_scenario(path: str, scale: float = 1.0, seed: Optional[int] = None) -> Scenario:
+    """YAML(.yaml/.yml) 또는 JSON 시나리오 파일 로드"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f) if path.endswith(".json") else yaml.safe_load(f)
+
+    defaults = data.get("defaults", {})
+    phases = []
+    start = 0.0
+    for i, spec in enumerate(data["phases"]):
+        phase = _parse_phase({**defaults, **spec}, start, i)
+        phases.append(phase)
+        start = phase.end
+
+    if not phases:
+        raise ValueError(f"시나리오에 단계가 없습니다: {path}")
+
+    return Scenario(
+        data.get("name", path),
+        phases,
+        scale=scale,
+        poisson=bool(data.get("poisson", False)),
+        seed=seed if seed is not None else data.get("seed")
+    )
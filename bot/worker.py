@@ -1,30 +1,37 @@
 import time
 import requests
-from threading import Thread, Lock, Event
+from queue import Queue, Empty, Full
+from threading import Thread, Event
+from typing import Callable, Dict, Optional
 
 from bot.config import (
     SPRING_ORDER_URL,
     SECRET_TOKEN,
     THREADS,
     ORDER_INTERVAL,
-    CATEGORY_MAP
+    COINS,
+    REPORT_INTERVAL,
+    REPORT_DIR,
+    PRICE_MODEL,
+    HTTP_TIMEOUT
 )
 from bot.order import create_order
-from bot.price import fetch_upbit_price
-from bot.interpolator import SmoothPriceInterpolator
+from bot.book import book_model
+from bot.price_stream import UpbitPriceStream, start_price_feed
+from bot.interpolator import VectorizedPriceInterpolator
+from bot.metrics import recorder, MetricsReporter
+from bot.pacing import Pacer
+from bot.lifecycle import Lifecycle
 
 
-interpolator = SmoothPriceInterpolator(alpha=0.15)
+# 틱 배치마다 전체 마켓을 한 번에 보간 (UpbitPriceStream.flush_frames)
+interpolator = VectorizedPriceInterpolator(alpha=0.15)
 
-print_lock = Lock()
 stop_event = Event()
 
-success = 0
-fail = 0
 
-
-def send_order(order: dict):
-    global success, fail
+def send_order(order: dict, pacer: Optional[Pacer] = None):
+    started = time.monotonic()
 
     try:
         res = requests.post(
@@ -34,82 +41,161 @@ def send_order(order: dict):
                 "X-Internal-Token": SECRET_TOKEN,
                 "Content-Type": "application/json"
             },
-            timeout=10
+            timeout=HTTP_TIMEOUT
         )
-
-        with print_lock:
-            if res.status_code == 200:
-                success += 1
-                print(
-                    f"✅ [BOT] {order['_coin']} "
-                    f"{order['orderType']} "
-                    f"{order['orderCount']} @ {order['orderPrice']}"
-                )
-            else:
-                fail += 1
-                print(f"❌ FAIL {res.status_code}")
-                print(f"   응답: {res.text}")
+        ok = res.status_code == 200
+        latency = time.monotonic() - started
+        recorder.record(order["_coin"], order["orderType"], latency, ok, str(res.status_code), started)
+        if pacer is not None:
+            pacer.on_response(str(res.status_code), latency, res.headers.get("Retry-After"))
+
+        # 콘솔 출력은 리포터 스레드가 담당 (요청 경로에서는 큐에 넣기만)
+        if not ok:
+            recorder.log_failure(str(res.status_code), res.text[:200])
+        elif recorder.should_sample():
+            recorder.log(
+                f"✅ [BOT] {order['_coin']} "
+                f"{order['orderType']} "
+                f"{order['orderCount']} @ {order['orderPrice']}"
+            )
 
     except Exception as e:
-        with print_lock:
-            fail += 1
-            print(f"💥 요청 예외: {e}")
+        latency = time.monotonic() - started
+        recorder.record(order["_coin"], order["orderType"], latency, False, "error", started)
+        recorder.log_failure("error", f"💥 요청 예외: {e}")
+        if pacer is not None:
+            pacer.on_response("error", latency)
+
 
+OrderSource = Callable[[], Optional[Dict]]
 
-def bot_worker():
+
+def bot_worker(order_source: OrderSource = create_order, index: int = 0, pacer: Optional[Pacer] = None):
+    """
+    :param index: 워커 번호 (pacer 의 동시 요청 한도 이상이면 쉼)
+    """
     while not stop_event.is_set():
-        order = create_order()
+        if pacer is not None:
+            if not pacer.allows(index):
+                time.sleep(pacer.IDLE_SLEEP)
+                continue
+            pacer.wait()
+
+        order = order_source()
 
         if order is None:
             time.sleep(0.1)
             continue
 
-        send_order(order)
+        send_order(order, pacer)
         time.sleep(ORDER_INTERVAL)
 
-def worker_loop():
-    coins = list(CATEGORY_MAP.keys())
+def worker_loop(frames: Queue):
+    """
+    실시간 시세 스트림 → 보간 프레임마다 주문 (차트용)
+    틱 하나가 steps 개 프레임으로 나뉘어 ORDER_INTERVAL 동안 나눠서 전송
+    """
+    while not stop_event.is_set():
+        try:
+            coin, smooth_prices = frames.get(timeout=0.5)
+        except Empty:
+            continue
 
-    while True:
-        prices = fetch_upbit_price(coins)
+        for price in smooth_prices:
+            order = create_order(coin, price)
+            if order is not None:
+                send_order(order)
 
-        for coin, upbit_price in prices.items():
-            smooth_prices = interpolator.smooth(coin, upbit_price)
+            # 차트 프레임 분할용 sleep
+            time.sleep(ORDER_INTERVAL / len(smooth_prices))
 
-            for price in smooth_prices:
-                order = create_order(coin, price)
-                send_order(order)
 
-                # 차트 프레임 분할용 sleep
-                time.sleep(ORDER_INTERVAL / len(smooth_prices))
+def start_stream(duration: Optional[float] = None, lifecycle: Optional[Lifecycle] = None):
+    print("\n🚀 BOT 차트 프레임 주문 시작 (업비트 WebSocket 시세)")
+    lifecycle = lifecycle or Lifecycle()
+
+    # 워커가 밀리면 오래된 프레임은 버림 (차트는 최신 시세가 중요)
+    frames: Queue = Queue(maxsize=THREADS * 10)
 
+    def on_frames(coin, smooth_prices):
+        try:
+            frames.put_nowait((coin, smooth_prices))
+        except Full:
+            pass
 
-def start():
-    print("\n🚀 BOT 주문 시뮬레이션 시작 (무한 실행)")
-    start_time = time.time()
+    stream = UpbitPriceStream(COINS, interpolator=interpolator, on_frames=on_frames)
+    stream.start_in_thread()
+
+    reporter = MetricsReporter(recorder, REPORT_INTERVAL)
+    reporter.start()
 
     threads = []
     for i in range(THREADS):
-        t = Thread(target=bot_worker, name=f"BOT-{i}")
+        t = Thread(target=worker_loop, args=(frames,), name=f"CHART-{i}", daemon=True)
         t.start()
         threads.append(t)
 
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n🛑 종료 신호 감지")
-        stop_event.set()
+    lifecycle.run_blocking(duration)
+    stop_event.set()
+    stream.stop()
+    lifecycle.join(threads)
+
+    reporter.stop()
+    print_summary(lifecycle.elapsed)
+    print(f"수신 틱    : {stream.ticks} (재접속 {stream.reconnects}회)")
+
+
+def start(
+    order_source: OrderSource = create_order,
+    duration: Optional[float] = None,
+    pacer: Optional[Pacer] = None,
+    lifecycle: Optional[Lifecycle] = None
+):
+    """
+    :param duration: 측정 시간(초, 워밍업 제외). None 이면 Ctrl-C 까지 무한 실행
+    :param pacer: 토큰 버킷 / 적응형 동시 요청 한도 (bot.pacing.build_pacer)
+    :param lifecycle: 워밍업 / 드레인 설정 (기본: BOT_WARMUP, BOT_DRAIN_TIMEOUT)
+    """
+    lifecycle = lifecycle or Lifecycle()
+    print(f"\n🚀 BOT 주문 시뮬레이션 시작 ({'무한 실행' if duration is None else f'{duration:.0f}초'})")
+    # 시세 워밍업 + 백그라운드 갱신 → 워커는 시세 조회로 블로킹되지 않음
+    start_price_feed(COINS)
+
+    reporter = MetricsReporter(recorder, REPORT_INTERVAL)
+    reporter.start()
+
+    # daemon: 드레인 시간 안에 응답을 못 받은 워커가 종료를 붙잡지 않도록
+    threads = []
+    for i in range(THREADS):
+        t = Thread(target=bot_worker, args=(order_source, i, pacer), name=f"BOT-{i}", daemon=True)
+        t.start()
+        threads.append(t)
+
+    lifecycle.run_blocking(duration)
+    stop_event.set()
+    lifecycle.join(threads)
 
-    for t in threads:
-        t.join()
+    reporter.stop()
+    print_summary(lifecycle.elapsed)
+    if pacer is not None:
+        print(f"페이싱    : {pacer.summary()}")
 
-    elapsed = time.time() - start_time
+
+def print_summary(elapsed: float):
+    recorder.drain()
+    success, fail = recorder.success, recorder.fail
     total = success + fail
 
     print("\n==============================")
     print(f"총 주문 수 : {total}")
     print(f"성공      : {success}")
     print(f"실패      : {fail}")
-    print(f"평균 TPS  : {total / elapsed:.2f}")
+    print(f"측정 시간 : {elapsed:.1f}초")
+    print(f"평균 TPS  : {total / elapsed if elapsed else 0.0:.2f}")
+    recorder.print_percentiles()
+    if PRICE_MODEL == "book" and book_model.marketable + book_model.resting:
+        print(f"호가 모델 : {book_model.summary()}")
     print("==============================")
+
+    json_path, csv_path = recorder.write_report(REPORT_DIR)
+    print(f"📝 리포트 저장: {json_path}, {csv_path}")
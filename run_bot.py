@@ -1,5 +1,193 @@
 # run_bot.py
-from bot.worker import start
+import argparse
+
+from bot.config import CONCURRENCY, RATE_LIMIT, ADAPTIVE
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="주문 트래픽 봇")
+    parser.add_argument(
+        "--mode",
+        choices=["thread", "async", "open", "stream", "knee"],
+        default="thread",
+        help=(
+            "thread: 스레드 워커 (기본) / async: asyncio + 커넥션 풀 엔진 / "
+            "open: 목표 TPS 스케줄대로 발사하는 오픈 루프 / "
+            "stream: 업비트 WebSocket 틱마다 차트 프레임 주문 / "
+            "knee: 목표 TPS 를 올려가며 SLO 를 지키는 최대 처리량 탐색 (bot.benchmark 와 같은 기준)"
+        )
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=CONCURRENCY,
+        help="async 모드 동시 요청 수 (커넥션 풀 크기)"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="실행 시간(초). 생략하면 Ctrl-C 까지 무한 실행 (open 모드는 60초)"
+    )
+
+    # ===== open 모드 부하 프로파일 =====
+    parser.add_argument(
+        "--profile",
+        choices=["constant", "ramp", "step", "poisson"],
+        default="constant"
+    )
+    parser.add_argument("--rate", type=float, default=100.0, help="시작(또는 고정) 목표 TPS")
+    parser.add_argument("--end-rate", type=float, default=None, help="ramp 최종 TPS / step 상한 TPS")
+    parser.add_argument("--step-rate", type=float, default=None, help="step 증가량 (기본: --rate)")
+    parser.add_argument("--step-every", type=float, default=10.0, help="step 간격(초) / knee 단계별 측정 시간")
+    parser.add_argument("--slo-p99-ms", type=float, default=None, help="knee 모드 p99 상한(ms, 기본: 벤치마크와 같음)")
+    parser.add_argument("--refine", type=int, default=3, help="knee 모드 이분 탐색 횟수")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드 (poisson 간격 / --pregen 주문)")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="async/open 모드를 N개 프로세스로 분산 (목표 TPS·동시 요청 수를 1/N 씩)"
+    )
+    parser.add_argument(
+        "--pregen",
+        action="store_true",
+        help="주문을 NumPy 로 블록 단위 미리 생성해 링 버퍼에서 꺼내 씀"
+    )
+    # ===== 페이싱 =====
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=RATE_LIMIT,
+        help="전체 송신 TPS 상한 (토큰 버킷, 0 이면 없음)"
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        default=ADAPTIVE,
+        help="429/503·지연 급증 시 동시 요청 수를 줄이고 회복되면 늘림 (AIMD)"
+    )
+    parser.add_argument(
+        "--scenario",
+        default=None,
+        help="시나리오 파일(YAML/JSON) 재생: 단계별 TPS 곡선 / 코인 쏠림 / BUY·SELL 비율 / 버스트 (open 엔진)"
+    )
+    args = parser.parse_args()
+
+    if args.scenario:
+        args.mode = "open"
+        if args.pregen:
+            print("⚠️ --scenario 는 단계별 코인/BUY 비율로 주문을 만들기 때문에 --pregen 을 무시합니다")
+            args.pregen = False
+
+    if args.processes > 1 and args.mode not in ("async", "open"):
+        parser.error(f"--processes 는 async / open 모드에서만 쓸 수 있습니다 (현재: {args.mode})")
+    return args
+
+
+def build_order_source(args):
+    from bot.order import create_order
+
+    if not args.pregen:
+        return create_order
+
+    from bot.config import COINS
+    from bot.order_stream import OrderStream
+    from bot.price_stream import start_price_feed
+
+    # 미리 생성하는 주문에 기준가가 들어가므로 시세부터 채움
+    start_price_feed(COINS)
+    return OrderStream(seed=args.seed).start()
+
 
 if __name__ == "__main__":
-    start()
+    args = parse_args()
+
+    if args.processes > 1 and args.mode in ("async", "open"):
+        from bot.multiproc import start_multiprocess
+
+        start_multiprocess(args.processes, {
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "duration": args.duration or (60.0 if args.mode == "open" and not args.scenario else None),
+            "pregen": args.pregen,
+            "seed": args.seed,
+            "profile": args.profile,
+            "rate": args.rate,
+            "end_rate": args.end_rate,
+            "step_rate": args.step_rate,
+            "step_every": args.step_every,
+            "scenario": args.scenario,
+            "rate_limit": args.rate_limit,
+            "adaptive": args.adaptive,
+        })
+        raise SystemExit(0)
+
+    order_source = build_order_source(args)
+
+    from bot.config import THREADS
+    from bot.pacing import build_pacer
+
+    pacer = build_pacer(
+        args.rate_limit,
+        args.adaptive,
+        THREADS if args.mode == "thread" else args.concurrency
+    )
+
+    if args.mode == "knee":
+        from bot.benchmark import DEFAULT_SLO_P99_MS, find_max_tps, print_table
+        from bot.config import REPORT_INTERVAL, WARMUP, DRAIN_TIMEOUT
+        from bot.metrics import recorder, MetricsReporter
+
+        slo_p99_ms = args.slo_p99_ms or DEFAULT_SLO_P99_MS
+        print(f"\n🔍 최대 지속 가능 처리량 탐색: {args.rate:.0f} TPS 부터 ×2 + 이분 탐색, 단계당 {args.step_every:.0f}초")
+        reporter = MetricsReporter(recorder, REPORT_INTERVAL)
+        reporter.start()
+        try:
+            result = find_max_tps(
+                args.rate,
+                args.end_rate or args.rate * 100,
+                args.step_every,
+                args.concurrency,
+                order_source,
+                slo_p99_ms=slo_p99_ms,
+                refine=args.refine,
+                warmup=WARMUP,
+                drain_timeout=DRAIN_TIMEOUT
+            )
+        finally:
+            reporter.stop()
+        print_table(result["runs"])
+        print(f"\n🏁 최대 지속 가능 TPS (p99 ≤ {slo_p99_ms:.0f}ms): {result['max_sustainable_tps']:.0f}")
+    elif args.scenario:
+        from bot.async_worker import start_open_loop
+        from bot.scenario import load_scenario
+
+        scenario = load_scenario(args.scenario, seed=args.seed)
+        start_open_loop(
+            scenario, args.duration or scenario.duration, args.concurrency, scenario.order_source, pacer
+        )
+    elif args.mode == "open":
+        from bot.async_worker import start_open_loop
+        from bot.load_profile import build_profile
+
+        duration = args.duration or 60.0
+        profile = build_profile(
+            args.profile,
+            args.rate,
+            duration,
+            end_rate=args.end_rate,
+            step_rate=args.step_rate,
+            step_every=args.step_every,
+            seed=args.seed
+        )
+        start_open_loop(profile, duration, args.concurrency, order_source, pacer)
+    elif args.mode == "stream":
+        from bot.worker import start_stream
+        start_stream(args.duration)
+    elif args.mode == "async":
+        from bot.async_worker import start_async
+        start_async(args.concurrency, args.duration, order_source, pacer)
+    else:
+        from bot.worker import start
+        start(order_source, args.duration, pacer)
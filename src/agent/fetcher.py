@@ -1,4 +1,4 @@
-import psycopg2
+from common.db import transaction
 
 class ContextFetcher:
     def __init__(self, db_config):
@@ -12,19 +12,15 @@ class ContextFetcher:
         comm_ids = [r['id'] for r in search_results if r['source'] == "community"]
         
         texts = []
-        conn = psycopg2.connect(**self.db_params)
-        cur = conn.cursor()
+        with transaction(self.db_params) as cur:
+            # news_id를 사용하여 실제 본문 조회
+            if news_ids:
+                cur.execute("SELECT description FROM news_data WHERE news_id IN %s", (tuple(news_ids),))
+                texts.extend([f"[과거 뉴스 참고]: {row[0][:300]}..." for row in cur.fetchall()])
+                
+            # community_id를 사용하여 실제 본문 조회
+            if comm_ids:
+                cur.execute("SELECT description FROM community_data WHERE community_id IN %s", (tuple(comm_ids),))
+                texts.extend([f"[과거 커뮤니티 참고]: {row[0][:300]}..." for row in cur.fetchall()])
 
-        # news_id를 사용하여 실제 본문 조회
-        if news_ids:
-            cur.execute("SELECT description FROM news_data WHERE news_id IN %s", (tuple(news_ids),))
-            texts.extend([f"[과거 뉴스 참고]: {row[0][:300]}..." for row in cur.fetchall()])
-            
-        # community_id를 사용하여 실제 본문 조회
-        if comm_ids:
-            cur.execute("SELECT description FROM community_data WHERE community_id IN %s", (tuple(comm_ids),))
-            texts.extend([f"[과거 커뮤니티 참고]: {row[0][:300]}..." for row in cur.fetchall()])
-
-        cur.close()
-        conn.close()
         return "\n\n".join(texts)
\ No newline at end of file
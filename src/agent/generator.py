@@ -3,10 +3,10 @@ import json
 import re
 import requests
 import pandas as pd
-import psycopg2
 from langchain_cohere import ChatCohere
 from .searcher import QdrantSearcher
 from .fetcher import ContextFetcher
+from common.db import transaction
 
 class ReportGenerator:
     def __init__(self, db_config, target_coins):
@@ -47,17 +47,12 @@ class ReportGenerator:
         except: return 50.0, "RSI 계산 실패"
 
     def fetch_current_data(self, symbol):
-        conn = psycopg2.connect(**self.db_config)
-        cur = conn.cursor()
-        cur.execute("SELECT title FROM news_data WHERE symbol = %s ORDER BY published_at DESC LIMIT 5", (symbol,))
-        news = "\n".join([f"- {r[0]}" for r in cur.fetchall()])
-        cur.close()
-        conn.close()
+        with transaction(self.db_config) as cur:
+            cur.execute("SELECT title FROM news_data WHERE symbol = %s ORDER BY published_at DESC LIMIT 5", (symbol,))
+            news = "\n".join([f"- {r[0]}" for r in cur.fetchall()])
         return news
 
     def save_report(self, cat_id, report_json, rsi_val, news_score, comm_score): # 인자 추가
-        conn = psycopg2.connect(**self.db_config)
-        cur = conn.cursor()
         query = """
             INSERT INTO sentiment_result 
             (category_id, total_score, total_label, summary, full_report, rsi, news_result, community_result, created_at)
@@ -72,35 +67,28 @@ class ReportGenerator:
                 community_result = EXCLUDED.community_result,
                 created_at = NOW();
         """
-        cur.execute(query, (
-            cat_id, 
-            report_json.get("confidence_score", 50), 
-            report_json.get("signal", "HOLD"),
-            report_json.get("primary_reason", ""), 
-            report_json.get("full_report", ""), 
-            float(rsi_val),
-            float(news_score), # 👈 뉴스 점수 추가
-            float(comm_score)  # 👈 커뮤니티 점수 추가
-        ))
-        conn.commit()
-        cur.close()
-        conn.close()
+        with transaction(self.db_config) as cur:
+            cur.execute(query, (
+                cat_id, 
+                report_json.get("confidence_score", 50), 
+                report_json.get("signal", "HOLD"),
+                report_json.get("primary_reason", ""), 
+                report_json.get("full_report", ""), 
+                float(rsi_val),
+                float(news_score), # 👈 뉴스 점수 추가
+                float(comm_score)  # 👈 커뮤니티 점수 추가
+            ))
 
     def get_avg_scores(self, symbol):
         """DB에서 해당 코인의 최근 뉴스/커뮤니티 평균 점수를 가져옵니다."""
-        conn = psycopg2.connect(**self.db_config)
-        cur = conn.cursor()
+        with transaction(self.db_config) as cur:
+            # 뉴스 평균 (최근 24시간 혹은 최근 20건 등)
+            cur.execute("SELECT AVG(sentiment_score) FROM news_data WHERE symbol = %s AND sentiment_score IS NOT NULL", (symbol,))
+            news_avg = cur.fetchone()[0] or 0.5
         
-        # 뉴스 평균 (최근 24시간 혹은 최근 20건 등)
-        cur.execute("SELECT AVG(sentiment_score) FROM news_data WHERE symbol = %s AND sentiment_score IS NOT NULL", (symbol,))
-        news_avg = cur.fetchone()[0] or 0.5
-        
-        # 커뮤니티 평균
-        cur.execute("SELECT AVG(sentiment_score) FROM community_data WHERE symbol = %s AND sentiment_score IS NOT NULL", (symbol,))
-        comm_avg = cur.fetchone()[0] or 0.5
-        
-        cur.close()
-        conn.close()
+            # 커뮤니티 평균
+            cur.execute("SELECT AVG(sentiment_score) FROM community_data WHERE symbol = %s AND sentiment_score IS NOT NULL", (symbol,))
+            comm_avg = cur.fetchone()[0] or 0.5
         return news_avg, comm_avg
 
     # 👇 [주의] 이 함수가 누락되면 아까와 같은 에러가 발생합니다!
@@ -5,11 +5,14 @@ import time
 import requests
 import re
 import pandas as pd
-import psycopg2
+import sys
 from datetime import datetime
 from langchain_cohere import ChatCohere
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.db import transaction
+
 load_dotenv()
 
 COHERE_API_KEY = os.getenv('COHERE_API_KEY')
@@ -37,33 +40,28 @@ def extract_json(text):
         return None
 
 def fetch_coin_specific_data(symbol):
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
-    
-    cur.execute("SELECT AVG(sentiment_score) FROM news_data WHERE symbol = %s", (symbol,))
-    row = cur.fetchone()
-    hist_news_avg = row[0] if row and row[0] else 0.5
+    with transaction(DB_CONFIG) as cur:
+        cur.execute("SELECT AVG(sentiment_score) FROM news_data WHERE symbol = %s", (symbol,))
+        row = cur.fetchone()
+        hist_news_avg = row[0] if row and row[0] else 0.5
     
-    cur.execute("SELECT AVG(sentiment_score) FROM community_data WHERE symbol = %s", (symbol,))
-    row = cur.fetchone()
-    hist_comm_avg = row[0] if row and row[0] else 0.5
+        cur.execute("SELECT AVG(sentiment_score) FROM community_data WHERE symbol = %s", (symbol,))
+        row = cur.fetchone()
+        hist_comm_avg = row[0] if row and row[0] else 0.5
     
-    cur.execute("SELECT AVG(sentiment_score) FROM news_data WHERE symbol = %s AND published_at >= NOW() - INTERVAL '24 HOURS'", (symbol,))
-    row = cur.fetchone()
-    curr_news_avg = row[0] if row and row[0] else hist_news_avg
+        cur.execute("SELECT AVG(sentiment_score) FROM news_data WHERE symbol = %s AND published_at >= NOW() - INTERVAL '24 HOURS'", (symbol,))
+        row = cur.fetchone()
+        curr_news_avg = row[0] if row and row[0] else hist_news_avg
 
-    cur.execute("SELECT AVG(sentiment_score) FROM community_data WHERE symbol = %s AND published_at >= NOW() - INTERVAL '24 HOURS'", (symbol,))
-    row = cur.fetchone()
-    curr_comm_avg = row[0] if row and row[0] else hist_comm_avg
+        cur.execute("SELECT AVG(sentiment_score) FROM community_data WHERE symbol = %s AND published_at >= NOW() - INTERVAL '24 HOURS'", (symbol,))
+        row = cur.fetchone()
+        curr_comm_avg = row[0] if row and row[0] else hist_comm_avg
 
-    cur.execute("SELECT title FROM news_data WHERE symbol = %s ORDER BY published_at DESC LIMIT 5", (symbol,))
-    news_rows = cur.fetchall()
+        cur.execute("SELECT title FROM news_data WHERE symbol = %s ORDER BY published_at DESC LIMIT 5", (symbol,))
+        news_rows = cur.fetchall()
     
-    cur.execute("SELECT title FROM community_data WHERE symbol = %s ORDER BY published_at DESC LIMIT 5", (symbol,))
-    comm_rows = cur.fetchall()
-
-    cur.close()
-    conn.close()
+        cur.execute("SELECT title FROM community_data WHERE symbol = %s ORDER BY published_at DESC LIMIT 5", (symbol,))
+        comm_rows = cur.fetchall()
     
     context_summary = f"[평균] 뉴스({hist_news_avg:.2f}), 커뮤니티({hist_comm_avg:.2f}) / [현재] 뉴스({curr_news_avg:.2f}), 커뮤니티({curr_comm_avg:.2f})"
     return context_summary, news_rows, comm_rows, curr_news_avg, curr_comm_avg
@@ -84,9 +82,6 @@ def get_rsi_analysis(ticker):
 
 def save_report_to_db(cat_id, report_json, rsi_val, news_avg, comm_avg):
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        cur = conn.cursor()
-        
         query = """
             INSERT INTO sentiment_result (
                 category_id, total_score, total_label, 
@@ -103,22 +98,20 @@ def save_report_to_db(cat_id, report_json, rsi_val, news_avg, comm_avg):
                 rsi = EXCLUDED.rsi,
                 created_at = NOW();
         """
-        cur.execute(query, (
-            cat_id,
-            report_json.get("confidence_score", 50),
-            report_json.get("signal", "HOLD"),
-            float(news_avg),
-            float(comm_avg),
-            report_json.get("primary_reason", ""),
-            report_json.get("full_report", ""),
-            float(rsi_val)
-        ))
-        conn.commit()
+        with transaction(DB_CONFIG) as cur:
+            cur.execute(query, (
+                cat_id,
+                report_json.get("confidence_score", 50),
+                report_json.get("signal", "HOLD"),
+                float(news_avg),
+                float(comm_avg),
+                report_json.get("primary_reason", ""),
+                report_json.get("full_report", ""),
+                float(rsi_val)
+            ))
         print(f"✅ ID {cat_id} 저장 완료")
     except Exception as e:
         print(f"❌ DB 저장 실패 (ID {cat_id}): {e}")
-    finally:
-        if conn: conn.close()
 
 def run_full_analysis():
     chat = ChatCohere(model="command-r-plus-08-2024", temperature=0.3)
@@ -1,6 +1,5 @@
 import feedparser
 import hashlib
-import psycopg2
 import time
 import schedule
 import requests
@@ -9,12 +8,33 @@ import logging
 import sys
 import torch
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
 from sentence_transformers import SentenceTransformer
 from datetime import datetime, timezone
 from time import mktime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.category_registry import get_registry
+from common.db import transaction, copy_merge
+from common.dedup import get_seen_filter
+from common.embedding import MAX_PENDING, embed_pending, trim_pending
+from common.feed_state import FeedStateStore
+from common.rate_limiter import TokenBucket, parse_retry_after
+
+COMMUNITY_COLUMNS = (
+    "symbol", "title", "description", "published_at", "hash_key", "platform", "ups", "is_test", "category_id"
+)
+
+# Reddit 요청 속도: 모든 워커가 토큰 버킷 하나를 공유 (분당 REDDIT_RPM 회)
+REDDIT_RPM = float(os.getenv("REDDIT_RPM", "20"))
+REDDIT_BURST = 4
+REDDIT_JITTER = 1.0  # seconds
+REDDIT_WORKERS = 4
+REDDIT_MAX_RETRIES = 2
+REDDIT_SORTS = ("new", "hot")
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -43,12 +63,22 @@ class CommunityCollector:
     def __init__(self, model):
         self.db_params = {
             "host": "localhost", "port": "15432",
-            "database": "app", "user": "postgres", "password": "0000"
+            "database": "app", "user": "postgres", "password": "0000",
+            # search_path=public 설정을 추가하여 테이블 찾기 에러 방지
+            "options": "-c search_path=public"
         }
+        # category 는 공용 캐시에서 조회 (변경 시 NOTIFY 로 무효화)
+        self.category_registry = get_registry(self.db_params)
+        self.category_registry.start_listener()
         
         self.embed_model = model # 주입받은 모델 사용
         self.qdrant_client = QdrantClient(url="http://localhost:6333")
         self.collection_name = "community_collection"
+        self.pending = []  # 새로 저장됐지만 아직 임베딩 전인 글 (point_id, 본문, 페이로드)
+        self.pending_lock = threading.Lock()
+        self.seen = get_seen_filter(self.db_params, "community_data", "community_id")
+        # 피드별 ETag / Last-Modified / 처리한 글 ID (조건부 GET)
+        self.feed_state = FeedStateStore(os.getenv("COMMUNITY_FEED_STATE", "feed_state_community.json"))
 
         self.subreddit_map = {
             "BTC": "bitcoin", "ETH": "ethereum", "SOL": "solana", "XRP": "xrp",
@@ -58,105 +88,148 @@ class CommunityCollector:
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         ]
+        # 요청마다 sleep 하던 것 대신 공용 속도 제한 + keep-alive 세션
+        self.limiter = TokenBucket(REDDIT_RPM / 60, burst=REDDIT_BURST, jitter=REDDIT_JITTER)
+        self.session = requests.Session()
 
     def _get_category_mapping(self):
-        """DB에서 symbol과 category_id 매핑 정보 가져오기"""
-        try:
-            conn = psycopg2.connect(**self.db_params)
-            cur = conn.cursor()
-            cur.execute("SELECT symbol, category_id FROM public.category")
-            rows = cur.fetchall()
-            conn.close()
-            return {r[0].upper(): r[1] for r in rows}
-        except Exception as e:
-            logging.error(f"⚠️ 카테고리 매핑 로드 실패: {e}")
-            return {}
+        """symbol과 category_id 매핑 정보 (공용 캐시, 로드 실패 시 빈 dict)"""
+        return self.category_registry.mapping()
 
     def _save_to_db(self, items, ticker, sort_type, cat_id):
+        """
+        DB 저장 후 새로 추가된 글은 임베딩 대기열(self.pending)에 쌓음 → 사이클 끝에 일괄 임베딩
+        :return: 새로 저장된 건수 (DB 에러면 None)
+        """
+        # 이미 저장된 hash_key 는 메모리에서 걸러냄 → 새 글이 없으면 DB 왕복 없음
+        items = self.seen.unseen(items, key=lambda item: item[4])
         if not items: return 0
-        conn = None
         saved_count = 0
         try:
-            # search_path=public 설정을 추가하여 테이블 찾기 에러 방지
-            conn = psycopg2.connect(**self.db_params, options="-c search_path=public")
-            cur = conn.cursor()
-            
-            query = """
-                INSERT INTO community_data
-                (symbol, title, description, published_at, hash_key, platform, ups, is_test, category_id)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (hash_key) DO UPDATE SET ups = EXCLUDED.ups
-                RETURNING community_id;
-            """
-            
-            for item in items:
-                db_item = item + (cat_id,)
-                cur.execute(query, db_item)
-                result = cur.fetchone()
-                
-                if result:
-                    comm_id = result[0]
-                    symbol, title, description, dt, hash_key, platform, ups, is_test = item
-                    
-                    # 벡터화 및 Qdrant 저장
-                    vector = self.embed_model.encode(f"passage: {description}").tolist()
-                    self.qdrant_client.upsert(
-                        collection_name=self.collection_name,
-                        points=[PointStruct(
-                            id=comm_id,
-                            vector=vector,
-                            payload={
-                                "category_id": cat_id,
-                                "sentiment": 0.0,
-                                "source_type": "community",
-                                "symbol": symbol
-                            }
-                        )]
-                    )
-                    saved_count += 1
+            with transaction(self.db_params) as cur:
+                # 스테이징 테이블로 COPY → 한 문장으로 병합 (이미 있는 글은 ups 만 갱신)
+                rows = [item + (cat_id,) for item in items]
+                new_rows = copy_merge(
+                    cur, "community_data", COMMUNITY_COLUMNS, rows,
+                    returning="community_id", update=("ups",)
+                )
+            self.seen.add(item[4] for item in items)
+            by_hash = {item[4]: item for item in items}
+
+            # 벡터화는 새로 추가된 글만 (ups 만 바뀐 글은 이미 Qdrant 에 있음)
+            for comm_id, hash_key in new_rows:
+                symbol, title, description, dt, hash_key, platform, ups, is_test = by_hash[hash_key]
+                with self.pending_lock:
+                    self.pending.append((comm_id, description, {
+                        "category_id": cat_id,
+                        "sentiment": 0.0,
+                        "source_type": "community",
+                        "symbol": symbol
+                    }))
+                saved_count += 1
             
-            conn.commit()
             if saved_count > 0: 
                 logging.info(f"💾 [{ticker}-{sort_type}] {saved_count}건 저장 완료")
         except Exception as e:
-            if conn: conn.rollback()
             logging.error(f"❌ DB 저장 에러: {e}")
-        finally:
-            if conn: conn.close()
+            return None
         return saved_count
 
+    def _flush_embeddings(self):
+        """대기열 일괄 임베딩 (성공한 청크만 비움)"""
+        if not self.pending: return
+        started = time.time()
+        try:
+            # 청크 단위로 저장, 성공한 청크는 self.pending 에서 바로 빠짐
+            count = embed_pending(self.embed_model, self.qdrant_client, self.collection_name, self.pending)
+            logging.info(f"🧠 임베딩 {count}건 Qdrant 저장 ({time.time() - started:.1f}초)")
+        except Exception as e:
+            # DB / 중복 필터 / 피드 상태에는 이미 반영됨 → 남은 것은 다음 사이클 시작 때 재시도
+            logging.error(f"❌ Qdrant 저장 실패 (남은 {len(self.pending)}건, 다음 사이클에 재시도): {e}")
+            dropped = trim_pending(self.pending)
+            if dropped:
+                logging.warning(
+                    f"⚠️ 임베딩 대기열 상한({MAX_PENDING}건) 초과 → 오래된 {dropped}건 제외 "
+                    f"(DB 에는 저장됨, src/vertordb/migrate_to_qdrant.py 로 재임베딩)"
+                )
+
+    def _request(self, url, tag):
+        """
+        속도 제한을 지키며 GET (429 면 Retry-After 만큼 모든 워커를 멈추고 재시도)
+        :return: 응답 (재시도를 다 써도 429 면 None)
+        """
+        for attempt in range(REDDIT_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            # 지난번 ETag / Last-Modified 로 조건부 요청 → 304 면 파싱·DB 작업 생략
+            headers = {'User-Agent': random.choice(self.user_agents), **self.feed_state.request_headers(url)}
+            resp = self.session.get(url, headers=headers, timeout=15)
+
+            if resp.status_code == 429:
+                wait = parse_retry_after(resp.headers.get('Retry-After')) or 60
+                logging.warning(f"⏳ [{tag}] 429 Too Many Requests → {wait:.0f}초 대기 ({attempt + 1}/{REDDIT_MAX_RETRIES + 1})")
+                self.limiter.pause(wait)
+                continue
+
+            # 남은 요청 수를 알려주면 바닥나기 전에 리셋 시각까지 쉼
+            remaining = resp.headers.get('X-Ratelimit-Remaining')
+            reset = resp.headers.get('X-Ratelimit-Reset')
+            try:
+                if remaining is not None and reset is not None and float(remaining) < 1:
+                    self.limiter.pause(float(reset))
+            except ValueError:
+                pass
+            return resp
+        return None
+
+    def _collect_one(self, ticker, subreddit, sort_type, cat_id):
+        """서브레딧 하나 × 정렬 하나 (워커 스레드에서 실행)"""
+        tag = f"{ticker}-{sort_type}"
+        url = f"https://www.reddit.com/r/{subreddit}/{sort_type}/.rss"
+        try:
+            resp = self._request(url, tag)
+            if resp is None: return
+            if resp.status_code == 304:
+                logging.info(f"💤 [{tag}] 변경 없음 (304)")
+                return
+            if resp.status_code != 200: return
+            
+            feed = feedparser.parse(resp.content)
+            items_to_save = []
+            # 지난번에 처리한 글은 건너뜀
+            for entry in self.feed_state.fresh(url, feed.entries):
+                dt = datetime.now(timezone.utc)
+                if hasattr(entry, 'published_parsed'):
+                    dt = datetime.fromtimestamp(mktime(entry.published_parsed), tz=timezone.utc)
+                
+                title = entry.title
+                description = getattr(entry, 'summary', '')
+                hash_key = hashlib.md5(f"{title}_{dt}".encode('utf-8')).hexdigest()
+                items_to_save.append((ticker, title, description, dt, hash_key, 'reddit', 0, True))
+
+            if self._save_to_db(items_to_save, ticker, sort_type, cat_id) is not None:
+                self.feed_state.commit(url, resp.headers, feed.entries)
+        except Exception as e:
+            logging.error(f"⚠️ 네트워크 에러 [{ticker}]: {e}")
+
     def collect_reddit(self):
         logging.info("👽 [Reddit-RSS] 수집 사이클 시작")
+        started = time.time()
         cat_map = self._get_category_mapping()
-        
-        for ticker, subreddit in self.subreddit_map.items():
-            cat_id = cat_map.get(ticker.upper())
-            if not cat_id: continue
-
-            for sort_type in ["new", "hot"]:
-                url = f"https://www.reddit.com/r/{subreddit}/{sort_type}/.rss"
-                try:
-                    headers = {'User-Agent': random.choice(self.user_agents)}
-                    resp = requests.get(url, headers=headers, timeout=15)
-                    if resp.status_code != 200: continue
-                    
-                    feed = feedparser.parse(resp.content)
-                    items_to_save = []
-                    for entry in feed.entries:
-                        dt = datetime.now(timezone.utc)
-                        if hasattr(entry, 'published_parsed'):
-                            dt = datetime.fromtimestamp(mktime(entry.published_parsed), tz=timezone.utc)
-                        
-                        title = entry.title
-                        description = getattr(entry, 'summary', '')
-                        hash_key = hashlib.md5(f"{title}_{dt}".encode('utf-8')).hexdigest()
-                        items_to_save.append((ticker, title, description, dt, hash_key, 'reddit', 0, True))
-
-                    self._save_to_db(items_to_save, ticker, sort_type, cat_id)
-                    time.sleep(random.randint(2, 5)) # 사이클 내 딜레이
-                except Exception as e:
-                    logging.error(f"⚠️ 네트워크 에러 [{ticker}]: {e}")
-        logging.info("✨ 수집 사이클 종료.")
+        # 지난 사이클에 Qdrant 저장이 실패한 글부터 재시도
+        self._flush_embeddings()
+
+        tasks = [
+            (ticker, subreddit, sort_type, cat_map[ticker.upper()])
+            for ticker, subreddit in self.subreddit_map.items() if cat_map.get(ticker.upper())
+            for sort_type in REDDIT_SORTS
+        ]
+        # 서브레딧 × 정렬을 워커 풀에서 동시에 (요청 속도는 self.limiter 가 제한)
+        with ThreadPoolExecutor(REDDIT_WORKERS, thread_name_prefix="reddit") as executor:
+            list(executor.map(lambda task: self._collect_one(*task), tasks))
+
+        self.feed_state.save()
+        self._flush_embeddings()
+        logging.info(f"✨ 수집 사이클 종료. ({len(tasks)}개 피드, {time.time() - started:.1f}초)")
 
 # ==========================================================
 # 🚀 2. 실행부: 스케줄러 설정
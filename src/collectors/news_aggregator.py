@@ -1,20 +1,28 @@
 import os
-import re
+import sys
 import hashlib
 import requests
-import psycopg2
 import time
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.category_registry import get_registry
+from common.db import transaction, copy_merge
+from common.dedup import get_seen_filter
+from common.symbol_matcher import get_matcher
+
 load_dotenv()
 
+NEWS_COLUMNS = ("category_id", "title", "description", "published_at", "symbol", "hash_key", "is_test")
+
 class NewsAggregator:
     def __init__(self):
         self.db_params = {
             "host": "localhost", "port": "15432",
             "database": "app", "user": "postgres", "password": "0000"
         }
+        self.category_registry = get_registry(self.db_params)
         self.tokens = {
             "CRYPTOPANIC": os.getenv('CRYPTOPANIC_TOKEN'),
             "ALPHAVANTAGE": os.getenv('ALPHA_VANTAGE_API_KEY')
@@ -31,85 +39,64 @@ class NewsAggregator:
             return None
 
     def _get_db_categories(self, limit_top_4=False):
-        try:
-            conn = psycopg2.connect(**self.db_params)
-            cur = conn.cursor()
-            if limit_top_4:
-                target_tickers = ('BTC', 'ETH', 'XRP', 'SOL')
-                cur.execute("SELECT symbol, category_name, category_id FROM public.category WHERE symbol IN %s", (target_tickers,))
-            else:
-                cur.execute("SELECT symbol, category_name, category_id FROM public.category")
-            
-            categories = [{'symbol': r[0].strip().upper(), 'name': r[1].strip().upper(), 'id': r[2]} for r in cur.fetchall()]
-            cur.close()
-            conn.close()
-            return categories
-        except Exception as e:
-            print(f"⚠️ 카테고리 로드 실패: {e}")
-            return []
+        # 공용 캐시에서 조회 (로드 실패 시 빈 리스트)
+        if limit_top_4:
+            return self.category_registry.subset(('BTC', 'ETH', 'XRP', 'SOL'))
+        return self.category_registry.subset()
 
     # [중요 변경] 테이블 종류에 따라 저장 로직 분기
     def _save_batch(self, items, source, table_name="news_data"):
         if not items: return
-        conn = None
-        try:
-            conn = psycopg2.connect(**self.db_params)
-            cur = conn.cursor()
-            inserted_count = 0
-
-            for item in items:
-                # 1. 공통 필드 추출
-                title = item.get('title', '')
-                symbol = item.get('assigned_symbol', '')
-                category_id = item.get('assigned_category_id')
-                description = item.get('description') or item.get('summary', '')
-                dt = self._parse_date(item.get('time_published') or item.get('created_at'))
-                
-                if not dt: continue
-                is_test = dt >= self.split_date
-                date_str = dt.strftime('%Y-%m-%d %H:%M:%S')
-                hash_key = hashlib.md5(f"{title.strip()}_{date_str}_{symbol}".encode()).hexdigest()
-
-                # 2. 테이블별 쿼리 분기
-                if table_name == "community_data":
-                    # community_data 전용 필드 처리
-                    # platform: kind 값 사용 (media, blog 등), 없으면 'unknown'
-                    platform = item.get('kind', 'unknown')
-                    
-                    # ups: votes 딕셔너리에서 liked나 positive 값 추출
-                    votes = item.get('votes', {})
-                    ups = votes.get('liked', 0) if isinstance(votes, dict) else 0
-                    if ups == 0 and isinstance(votes, dict):
-                         ups = votes.get('positive', 0)
-
-                    query = """
-                    INSERT INTO public.community_data
-                    (category_id, title, description, published_at, symbol, hash_key, is_test, platform, ups) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (hash_key) DO NOTHING;
-                    """
-                    cur.execute(query, (category_id, title, description, dt, symbol, hash_key, is_test, platform, ups))
-
-                else:
-                    # news_data (기본)
-                    query = """
-                    INSERT INTO public.news_data
-                    (category_id, title, description, published_at, symbol, hash_key, is_test) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (hash_key) DO NOTHING;
-                    """
-                    cur.execute(query, (category_id, title, description, dt, symbol, hash_key, is_test))
+        rows = []
+        for item in items:
+            # 1. 공통 필드 추출
+            title = item.get('title', '')
+            symbol = item.get('assigned_symbol', '')
+            category_id = item.get('assigned_category_id')
+            description = item.get('description') or item.get('summary', '')
+            dt = self._parse_date(item.get('time_published') or item.get('created_at'))
+            
+            if not dt: continue
+            is_test = dt >= self.split_date
+            date_str = dt.strftime('%Y-%m-%d %H:%M:%S')
+            hash_key = hashlib.md5(f"{title.strip()}_{date_str}_{symbol}".encode()).hexdigest()
+
+            # 2. 테이블별 컬럼 분기
+            if table_name == "community_data":
+                # community_data 전용 필드 처리
+                # platform: kind 값 사용 (media, blog 등), 없으면 'unknown'
+                platform = item.get('kind', 'unknown')
                 
-                if cur.rowcount > 0: inserted_count += 1
+                # ups: votes 딕셔너리에서 liked나 positive 값 추출
+                votes = item.get('votes', {})
+                ups = votes.get('liked', 0) if isinstance(votes, dict) else 0
+                if ups == 0 and isinstance(votes, dict):
+                     ups = votes.get('positive', 0)
+
+                rows.append((category_id, title, description, dt, symbol, hash_key, is_test, platform, ups))
+            else:
+                # news_data (기본)
+                rows.append((category_id, title, description, dt, symbol, hash_key, is_test))
 
-            conn.commit()
-            if inserted_count > 0:
-                print(f"💾 [{source}] -> [{table_name}] {inserted_count}건 저장 완료")
+        # 3. 스테이징 테이블로 COPY → INSERT ... SELECT ... ON CONFLICT 한 번으로 병합
+        if table_name == "community_data":
+            columns, returning = NEWS_COLUMNS + ("platform", "ups"), "community_id"
+        else:
+            columns, returning = NEWS_COLUMNS, "news_id"
+
+        # 이미 저장된 hash_key 는 메모리에서 걸러냄 (백필에서 겹치는 구간 대부분)
+        seen = get_seen_filter(self.db_params, table_name, returning)
+        rows = seen.unseen(rows, key=lambda row: row[5])
+        if not rows: return
+
+        try:
+            with transaction(self.db_params) as cur:
+                inserted = copy_merge(cur, table_name, columns, rows, returning=returning)
+            seen.add(row[5] for row in rows)
+            if inserted:
+                print(f"💾 [{source}] -> [{table_name}] {len(inserted)}건 저장 완료")
         except Exception as e:
-            if conn: conn.rollback()
             print(f"❌ DB 저장 에러 ({table_name}): {e}")
-        finally:
-            if conn: conn.close()
 
     def fetch_alpha_vantage(self, start_time=None, end_time=None):
         # AlphaVantage는 전부 news_data로 저장
@@ -126,22 +113,23 @@ class NewsAggregator:
             data = res.json()
             articles = data.get('feed', [])
             
+            matcher = get_matcher(categories)
             matched_list = []
             for art in articles:
                 title = (art.get('title') or '').upper()
                 av_tickers = [t.get('ticker', '').replace("CRYPTO:", "").upper() for t in art.get('ticker_sentiment', [])]
-                for cat in categories:
-                    if cat['symbol'] in av_tickers or re.search(rf"\b{cat['symbol']}\b", title) or re.search(rf"\b{cat['name']}\b", title):
-                        item = art.copy()
-                        item['assigned_symbol'] = cat['symbol']
-                        item['assigned_category_id'] = cat['id']
-                        matched_list.append(item)
+                for cat in matcher.match(title, also=av_tickers):
+                    item = art.copy()
+                    item['assigned_symbol'] = cat['symbol']
+                    item['assigned_category_id'] = cat['id']
+                    matched_list.append(item)
             
             self._save_batch(matched_list, "AlphaVantage", "news_data")
         except Exception as e: print(f"❌ AV 에러: {e}")
 
     def fetch_cryptopanic(self, target_date_limit=None):
         categories = self._get_db_categories(limit_top_4=(target_date_limit is None))
+        matcher = get_matcher(categories)
         
         url = "https://cryptopanic.com/api/developer/v2/posts/"
         
@@ -186,14 +174,9 @@ class NewsAggregator:
                     title_upper = title.upper()
                     cp_currencies = [c.get('code', '').upper() for c in art.get('currencies', [])]
 
-                    # 카테고리 매칭
-                    matched_cat = None
-                    for cat in categories:
-                        if (cat['symbol'] in cp_currencies) or \
-                           (re.search(rf"\b{cat['symbol']}\b", title_upper)) or \
-                           (re.search(rf"\b{cat['name']}\b", title_upper)):
-                            matched_cat = cat
-                            break 
+                    # 카테고리 매칭 (여러 개 걸리면 카테고리 순서상 첫 번째)
+                    matches = matcher.match(title_upper, also=cp_currencies)
+                    matched_cat = matches[0] if matches else None
                     
                     if matched_cat:
                         item = art.copy()
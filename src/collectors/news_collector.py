@@ -1,29 +1,46 @@
-import feedparser
 import hashlib
-import psycopg2
+import os
 import re
+import sys
 import time
 import schedule
 import torch
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
 from sentence_transformers import SentenceTransformer
 from datetime import datetime, timezone
 from time import mktime
 from dateutil import parser
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.category_registry import get_registry
+from common.db import transaction, copy_merge
+from common.dedup import get_seen_filter
+from common.embedding import MAX_PENDING, embed_pending, trim_pending
+from common.feed_fetcher import fetch_feeds
+from common.feed_state import FeedStateStore
+from common.symbol_matcher import get_matcher
+
+NEWS_COLUMNS = ("category_id", "title", "description", "published_at", "symbol", "hash_key", "is_test")
+
 class RssCollector:
     def __init__(self):
         self.db_params = {
             "host": "localhost", "port": "15432",
             "database": "app", "user": "postgres", "password": "0000"
         }
+        # category 는 공용 캐시에서 조회 (변경 시 NOTIFY 로 무효화)
+        self.category_registry = get_registry(self.db_params)
+        self.category_registry.start_listener()
         
         # 벡터 DB 및 임베딩 모델 설정
         self.device = "mps" if torch.backends.mps.is_available() else "cpu"
         self.embed_model = SentenceTransformer('intfloat/multilingual-e5-small', device=self.device)
         self.qdrant_client = QdrantClient(url="http://localhost:6333")
         self.collection_name = "news_collection"
+        self.pending = []  # 새로 저장됐지만 아직 임베딩 전인 글 (point_id, 본문, 페이로드)
+        self.seen = get_seen_filter(self.db_params, "news_data", "news_id")
+        # 피드별 ETag / Last-Modified / 처리한 글 ID (조건부 GET)
+        self.feed_state = FeedStateStore(os.getenv("NEWS_FEED_STATE", "feed_state_news.json"))
 
         self.static_feeds = {
             "CoinTelegraph": "https://cointelegraph.com/rss",
@@ -39,79 +56,92 @@ class RssCollector:
 
     def _get_db_categories(self):
         TARGET_WHITELIST = ['BTC', 'ETH', 'SOL', 'XRP', 'ADA', 'DOGE', 'DOT', 'LINK']
-        try:
-            conn = psycopg2.connect(**self.db_params)
-            cur = conn.cursor()
-            cur.execute("SELECT symbol, category_name, category_id FROM public.category")
-            rows = cur.fetchall()
-            conn.close()
-            cleaned = []
-            if not rows: return [{'symbol': 'BTC', 'name': 'BITCOIN', 'id': 1}]
-            for r in rows:
-                s = r[0].strip().upper()
-                if s in TARGET_WHITELIST:
-                    cleaned.append({'symbol': s, 'name': r[1].strip().upper(), 'id': r[2]})
-            return cleaned
-        except: return []
+        if not self.category_registry.categories():
+            # 테이블이 비어 있으면 BTC 만, 로드 자체가 실패했으면 수집 안 함
+            return [{'symbol': 'BTC', 'name': 'BITCOIN', 'id': 1}] if self.category_registry.version else []
+        return self.category_registry.subset(TARGET_WHITELIST)
 
     def _save_to_db(self, items):
+        """
+        DB 저장 후 새로 추가된 글은 임베딩 대기열(self.pending)에 쌓음 → 사이클 끝에 일괄 임베딩
+        :return: 새로 저장된 건수 (DB 에러면 None)
+        """
+        # 이미 저장된 hash_key 는 메모리에서 걸러냄 → 새 글이 없으면 DB 왕복 없음
+        items = self.seen.unseen(items, key=lambda item: item[5])
         if not items: return 0
-        conn = None
         saved = 0
         try:
-            conn = psycopg2.connect(**self.db_params)
-            cur = conn.cursor()
-            query = """
-                INSERT INTO public.news_data
-                (category_id, title, description, published_at, symbol, hash_key, is_test) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (hash_key) DO NOTHING
-                RETURNING news_id;
-            """
-            for item in items:
-                cur.execute(query, item)
-                result = cur.fetchone()
-                
-                if result:
-                    news_id = result[0]
-                    cat_id, title, desc, dt, symbol, hash_key, is_test = item
-                    
-                    # Qdrant 저장 (통일된 페이로드 구조)
-                    vector = self.embed_model.encode(f"passage: {desc}").tolist()
-                    self.qdrant_client.upsert(
-                        collection_name=self.collection_name,
-                        points=[PointStruct(
-                            id=news_id,
-                            vector=vector,
-                            payload={
-                                "category_id": cat_id,
-                                "sentiment": 0.0,
-                                "source_type": "news",
-                                "symbol": symbol
-                            }
-                        )]
-                    )
-                    saved += 1
-            conn.commit()
+            with transaction(self.db_params) as cur:
+                # 스테이징 테이블로 COPY → 한 문장으로 병합, 새로 추가된 행만 돌려받음
+                new_rows = copy_merge(cur, "news_data", NEWS_COLUMNS, items, returning="news_id")
+            self.seen.add(item[5] for item in items)
+            by_hash = {item[5]: item for item in items}
+
+            for news_id, hash_key in new_rows:
+                cat_id, title, desc, dt, symbol, hash_key, is_test = by_hash[hash_key]
+                # Qdrant 페이로드 (통일된 구조)
+                self.pending.append((news_id, desc, {
+                    "category_id": cat_id,
+                    "sentiment": 0.0,
+                    "source_type": "news",
+                    "symbol": symbol
+                }))
+                saved += 1
         except Exception as e:
-            if conn: conn.rollback()
             print(f"❌ DB 에러: {e}")
-        finally:
-            if conn: conn.close()
+            return None
         return saved
 
+    def _flush_embeddings(self):
+        """대기열 일괄 임베딩 (성공한 청크만 비움)"""
+        if not self.pending: return
+        started = time.time()
+        try:
+            # 청크 단위로 저장, 성공한 청크는 self.pending 에서 바로 빠짐
+            count = embed_pending(self.embed_model, self.qdrant_client, self.collection_name, self.pending)
+            print(f"🧠 임베딩 {count}건 Qdrant 저장 ({time.time() - started:.1f}초)")
+        except Exception as e:
+            # DB / 중복 필터 / 피드 상태에는 이미 반영됨 → 남은 것은 다음 사이클 시작 때 재시도
+            print(f"❌ Qdrant 저장 실패 (남은 {len(self.pending)}건, 다음 사이클에 재시도): {e}")
+            dropped = trim_pending(self.pending)
+            if dropped:
+                print(
+                    f"⚠️ 임베딩 대기열 상한({MAX_PENDING}건) 초과 → 오래된 {dropped}건 제외 "
+                    f"(DB 에는 저장됨, src/vertordb/migrate_to_qdrant.py 로 재임베딩)"
+                )
+
     def collect_rss(self):
         categories = self._get_db_categories()
         total_saved = 0
+        # 지난 사이클에 Qdrant 저장이 실패한 글부터 재시도
+        self._flush_embeddings()
         print(f"\n📡 [뉴스 수집 시작] ({datetime.now().strftime('%H:%M:%S')})")
 
-        for cat in categories:
+        # 1. 전체 피드 동시 다운로드 + 파싱 (사이클 시간 ≈ 가장 느린 피드 하나)
+        #    지난번 ETag / Last-Modified 로 조건부 요청 → 바뀐 게 없으면 304 (파싱 생략)
+        google_feeds = [
+            (cat['symbol'], f"https://news.google.com/rss/search?q={cat['symbol']}+crypto+when:1d&hl=en-US&gl=US&ceid=US:en")
+            for cat in categories
+        ]
+        static_feeds = list(self.static_feeds.items())
+        started = time.time()
+        results = fetch_feeds([
+            (key, url, self.feed_state.request_headers(url)) for key, url in google_feeds + static_feeds
+        ])
+        google_results, static_results = results[:len(google_feeds)], results[len(google_feeds):]
+        unchanged = sum(1 for r in results if r.status == 304)
+        print(f"   ⏱️ 피드 {len(results)}개 다운로드 {time.time() - started:.1f}초 (변경 없음 {unchanged}개)")
+
+        # 2. 저장은 피드 순서대로 (지난번에 처리한 글은 건너뜀)
+        for cat, result in zip(categories, google_results):
             symbol = cat['symbol']
-            url = f"https://news.google.com/rss/search?q={symbol}+crypto+when:1d&hl=en-US&gl=US&ceid=US:en"
+            if result.status == 304: continue
+            if result.error or result.status != 200:
+                print(f"      ⚠️ Google {symbol} 에러: {result.error or result.status}")
+                continue
             try:
-                feed = feedparser.parse(url)
                 items = []
-                for entry in feed.entries:
+                for entry in self.feed_state.fresh(result.url, result.entries):
                     title = entry.title
                     raw_desc = getattr(entry, 'description', '') or getattr(entry, 'summary', '')
                     desc = re.sub('<[^<]+?>', '', raw_desc)[:800].strip()
@@ -125,18 +155,22 @@ class RssCollector:
                     items.append((cat['id'], title, desc, dt, symbol, hash_key, True))
                 
                 count = self._save_to_db(items)
+                if count is None: continue
+                self.feed_state.commit(result.url, result.headers, result.entries)
                 if count > 0:
                     print(f"      ✅ [{symbol}] {count}건 저장")
                     total_saved += count
             except Exception as e:
                 print(f"      ⚠️ Google {symbol} 에러: {e}")
 
-        for source, url in self.static_feeds.items():
+        # 심볼 단어 단위 매칭 (정규식 하나, 카테고리 구성이 바뀔 때만 재생성)
+        matcher = get_matcher(categories, use_names=False)
+        for result in static_results:
+            source = result.key
             try:
-                feed = feedparser.parse(url, agent='Mozilla/5.0')
-                if not feed.entries: continue
+                if not result.entries: continue
                 items = []
-                for entry in feed.entries:
+                for entry in self.feed_state.fresh(result.url, result.entries):
                     title = entry.title
                     raw_desc = getattr(entry, 'summary', '') or getattr(entry, 'description', '')
                     desc = re.sub('<[^<]+?>', '', raw_desc)[:800].strip()
@@ -144,18 +178,27 @@ class RssCollector:
                     dt = datetime.now(timezone.utc)
                     if hasattr(entry, 'published_parsed') and entry.published_parsed:
                         dt = datetime.fromtimestamp(mktime(entry.published_parsed), tz=timezone.utc)
-                    for cat in categories:
-                        if cat['symbol'] in text_search:
-                            hash_key = hashlib.md5(f"{title}_{cat['symbol']}".encode()).hexdigest()
-                            items.append((cat['id'], title, desc, dt, cat['symbol'], hash_key, True))
+                    for cat in matcher.match(text_search):
+                        hash_key = hashlib.md5(f"{title}_{cat['symbol']}".encode()).hexdigest()
+                        items.append((cat['id'], title, desc, dt, cat['symbol'], hash_key, True))
                 count = self._save_to_db(items)
+                if count is None: continue
+                self.feed_state.commit(result.url, result.headers, result.entries)
                 if count > 0:
                     print(f"      ✅ [{source}] {count}건 저장")
                     total_saved += count
             except: continue
+        self.feed_state.save()
+        self._flush_embeddings()
         print(f"✨ 전체 수집 완료. 총 {total_saved}건 저장.")
 
-def job(): RssCollector().collect_rss()
+_collector = None
+
+def job():
+    # 임베딩 모델은 한 번만 로드하고 사이클마다 재사용
+    global _collector
+    if _collector is None: _collector = RssCollector()
+    _collector.collect_rss()
 
 if __name__ == "__main__":
     job()
@@ -0,0 +1,166 @@
+"""
+public.category 공용 캐시 (수집기 / 분석기 공통)
+
+- TTL 동안은 메모리에서 symbol → category 조회 (사이클마다 DB 재조회 X)
+- category 테이블이 바뀌면 트리거가 NOTIFY → 리스너 스레드가 캐시 무효화
+  (bot/category_sync.py 의 동기화도 같은 트리거로 전파됨)
+- 트리거는 배포 시 sql/category_changed_trigger.sql 로 한 번만 설치
+  (수집기 시작마다 DDL 을 돌리지 않음, 필요하면 CATEGORY_INSTALL_TRIGGER=1)
+- LISTEN 연결이 끊겨도 TTL 이 지나면 다시 읽으므로 최대 ttl 초만 늦음
+
+    registry = get_registry(db_params)
+    registry.categories()          # [{'symbol', 'name', 'id', 'is_active'}, ...]
+    registry.mapping()             # {'BTC': 1, ...}
+    registry.start_listener()      # 변경 알림 구독 (선택, LISTEN 만)
+"""
+import os
+import select
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psycopg2
+
+from common.db import transaction
+
+NOTIFY_CHANNEL = "category_changed"
+DEFAULT_TTL = 300  # seconds
+
+# category 변경 시 NOTIFY 를 보내는 트리거 (마이그레이션 파일, install_trigger() 도 이 파일을 실행)
+TRIGGER_SQL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "category_changed_trigger.sql")
+# 1 이면 start_listener() 가 트리거가 없을 때 직접 설치 (DDL 권한 필요, 기본은 끔)
+INSTALL_TRIGGER = os.getenv("CATEGORY_INSTALL_TRIGGER", "0") == "1"
+
+
+class CategoryRegistry:
+    def __init__(self, db_params: Dict, ttl: float = DEFAULT_TTL):
+        self.db_params = db_params
+        self.ttl = ttl
+
+        self._rows: Optional[List[Dict]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+        # 내용이 실제로 바뀔 때마다 +1 (심볼 매처 등 파생 데이터 재생성 여부 판단용)
+        self.version = 0
+
+    def _load(self) -> List[Dict]:
+        with transaction(self.db_params) as cur:
+            cur.execute("SELECT symbol, category_name, category_id, is_active FROM public.category")
+            rows = cur.fetchall()
+
+        # category_sync 로 새로 추가된 코인은 category_name 이 비어 있을 수 있음 → 심볼로 대체
+        return [
+            {
+                'symbol': r[0].strip().upper(),
+                'name': (r[1] or r[0]).strip().upper(),
+                'id': r[2],
+                'is_active': bool(r[3])
+            }
+            for r in rows
+        ]
+
+    def categories(self) -> List[Dict]:
+        """캐시된 category 전체 (만료됐으면 다시 읽음, 실패하면 이전 캐시 유지)"""
+        with self._lock:
+            if self._rows is None or time.monotonic() - self._loaded_at >= self.ttl:
+                try:
+                    rows = self._load()
+                    if rows != self._rows:
+                        self.version += 1
+                    self._rows = rows
+                except Exception as e:
+                    print(f"⚠️ 카테고리 로드 실패: {e}" + (" (이전 캐시 사용)" if self._rows else ""))
+                    if self._rows is None:
+                        return []
+                # 실패해도 갱신 시각은 기록 → DB 장애 중에 호출마다 재시도하지 않음
+                self._loaded_at = time.monotonic()
+            return self._rows
+
+    def subset(self, symbols=None, active_only: bool = False) -> List[Dict]:
+        """symbols 에 속한 (active_only 면 활성) 카테고리만"""
+        wanted = {s.upper() for s in symbols} if symbols is not None else None
+        return [
+            c for c in self.categories()
+            if (wanted is None or c['symbol'] in wanted) and (not active_only or c['is_active'])
+        ]
+
+    def mapping(self, active_only: bool = False) -> Dict[str, int]:
+        return {c['symbol']: c['id'] for c in self.subset(active_only=active_only)}
+
+    def get_id(self, symbol: str) -> Optional[int]:
+        return self.mapping().get(symbol.strip().upper())
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = 0.0
+
+    # ===== 변경 알림 (LISTEN / NOTIFY) =====
+    def install_trigger(self):
+        """트리거가 없으면 설치 (운영에서는 마이그레이션으로 적용하고 이 함수는 개발용)"""
+        with open(TRIGGER_SQL_PATH, encoding="utf-8") as f:
+            trigger_sql = f.read()
+
+        with transaction(self.db_params) as cur:
+            cur.execute(
+                "SELECT 1 FROM pg_trigger WHERE tgname = 'category_changed' "
+                "AND tgrelid = 'public.category'::regclass"
+            )
+            if cur.fetchone() is None:
+                cur.execute(trigger_sql)
+                print("🔔 category 변경 알림 트리거 설치 완료")
+
+    def start_listener(self, install: bool = INSTALL_TRIGGER):
+        """백그라운드 스레드에서 LISTEN (프로세스당 1개, install=True 일 때만 트리거 설치 시도)"""
+        if self._listener is not None:
+            return
+        if install:
+            try:
+                self.install_trigger()
+            except Exception as e:
+                print(f"⚠️ category 트리거 설치 실패 (TTL 갱신만 사용): {e}")
+
+        self._listener = threading.Thread(target=self._listen_loop, name="category-listener", daemon=True)
+        self._listener.start()
+
+    def _listen_loop(self):
+        backoff = 1
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.db_params)
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL};")
+                # 끊겨 있던 동안의 알림은 못 받았으므로 한 번 무효화
+                self.invalidate()
+                backoff = 1
+
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.invalidate()
+            except Exception as e:
+                print(f"⚠️ category 알림 연결 끊김 ({backoff}초 후 재연결): {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if conn:
+                    conn.close()
+
+
+# 프로세스 안에서 같은 DB 를 보는 수집기끼리 하나의 캐시를 공유
+_registries: Dict[tuple, CategoryRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(db_params: Dict, ttl: float = DEFAULT_TTL) -> CategoryRegistry:
+    key = tuple(sorted(db_params.items()))
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = CategoryRegistry(db_params, ttl)
+        return registry
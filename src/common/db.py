@@ -0,0 +1,152 @@
+"""
+프로세스 공용 PostgreSQL 커넥션 풀
+
+- 접속 정보(db_params)마다 ThreadedConnectionPool 하나 → 수집 사이클마다 connect/close 하지 않음
+- 풀이 다 쓰이면 PoolError 대신 반납될 때까지 대기 (수집기 병렬 실행 대비)
+- 끊긴 커넥션은 반납 시 버려지고 다음 대여 때 새로 연결
+
+    with transaction(db_params) as cur:       # 정상 종료 → commit, 예외 → rollback
+        cur.execute(...)
+        new_rows = copy_merge(cur, "news_data", columns, rows, returning="news_id")
+"""
+import io
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+MIN_CONN = 1
+MAX_CONN = 10
+
+
+class _Pool:
+    def __init__(self, db_params: Dict, minconn: int, maxconn: int):
+        self.pool = ThreadedConnectionPool(minconn, maxconn, **db_params)
+        self.slots = threading.BoundedSemaphore(maxconn)
+
+    @contextmanager
+    def connection(self) -> Iterator["psycopg2.extensions.connection"]:
+        with self.slots:
+            conn = self.pool.getconn()
+            if conn.closed:
+                self.pool.putconn(conn, close=True)
+                conn = self.pool.getconn()
+
+            broken = False
+            try:
+                yield conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            finally:
+                self.pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+_pools: Dict[tuple, _Pool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_params: Dict, minconn: int = MIN_CONN, maxconn: int = MAX_CONN) -> _Pool:
+    key = tuple(sorted(db_params.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _Pool(db_params, minconn, maxconn)
+        return pool
+
+
+@contextmanager
+def connection(db_params: Dict):
+    """풀에서 커넥션 대여 (트랜잭션 처리는 호출자 몫)"""
+    with get_pool(db_params).connection() as conn:
+        yield conn
+
+
+@contextmanager
+def transaction(db_params: Dict):
+    """커서 하나로 트랜잭션 실행: 정상 종료 시 commit, 예외 시 rollback 후 다시 raise"""
+    with connection(db_params) as conn:
+        try:
+            with conn.cursor() as cur:
+                yield cur
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+
+
+def _copy_value(value) -> str:
+    """COPY text 포맷 한 칸 (NULL → \\N, 탭/줄바꿈/역슬래시 이스케이프)"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_merge(
+    cur,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence],
+    returning: str,
+    key: str = "hash_key",
+    update: Sequence[str] = ()
+) -> List[Tuple]:
+    """
+    rows 를 임시 스테이징 테이블에 COPY 한 뒤 한 문장으로 public.{table} 에 병합
+    (행마다 INSERT 하던 것을 왕복 2번으로)
+
+    - 배치 안에서 key 가 겹치면 그중 한 행만 사용
+    - update 에 준 컬럼은 충돌 시 갱신 (ON CONFLICT DO UPDATE), 없으면 DO NOTHING
+    :return: 새로 추가된 행의 [(returning 값, key 값)] (갱신만 된 행은 제외)
+    """
+    if not rows:
+        return []
+
+    stage = f"stage_{table}"
+    cols = ", ".join(columns)
+
+    # 트랜잭션 안에서만 쓰는 임시 테이블 (제약조건 없이 컬럼 타입만 복사, 커밋 시 삭제)
+    # 호출마다 컬럼 구성이 다를 수 있어 매번 새로 만듦
+    cur.execute(f"DROP TABLE IF EXISTS pg_temp.{stage}")
+    cur.execute(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+        f"SELECT {cols} FROM public.{table} WITH NO DATA"
+    )
+
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_copy_value(v) for v in row) + "\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY {stage} ({cols}) FROM STDIN", buf)
+
+    if update:
+        conflict = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in update)
+    else:
+        conflict = "DO NOTHING"
+
+    # xmax = 0 → 이번 문장에서 새로 INSERT 된 행 (DO UPDATE 로 갱신된 행과 구분)
+    cur.execute(f"""
+        INSERT INTO public.{table} ({cols})
+        SELECT DISTINCT ON ({key}) {cols} FROM {stage} ORDER BY {key}
+        ON CONFLICT ({key}) {conflict}
+        RETURNING {returning}, {key}, (xmax = 0)
+    """)
+    return [(row[0], row[1]) for row in cur.fetchall() if row[2]]
+
+
+def close_all():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.pool.closeall()
+        _pools.clear()
@@ -0,0 +1,116 @@
+"""
+hash_key 중복 사전 필터 (Bloom filter)
+
+- 시작 시 테이블의 최근 hash_key 로 채워두고, 저장에 성공한 배치의 키를 계속 추가
+- 이미 본 키는 메모리에서 걸러서 DB 까지 가지 않음 → 대부분이 중복인 RSS 사이클의 DB 작업 감소
+- Bloom filter 라 '없다'는 확실하고 '있다'는 확률적 → 새 글이 error_rate 확률로 건너뛰어질 수 있음
+- 용량을 넘기면 DB 기준으로 다시 채움 (오탐률이 올라가지 않도록)
+
+    seen = get_seen_filter(db_params, "news_data", "news_id")
+    items = seen.unseen(items, key=lambda item: item[5])
+    ... 저장 성공 후 seen.add(item[5] for item in items)
+"""
+import hashlib
+import math
+import threading
+from typing import Callable, Dict, Iterable, List
+
+from common.db import transaction
+
+DEFAULT_CAPACITY = 200_000
+DEFAULT_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # 해시 2개로 k 개 위치를 만드는 double hashing
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenFilter:
+    def __init__(
+        self,
+        db_params: Dict,
+        table: str,
+        id_column: str,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE
+    ):
+        self.db_params = db_params
+        self.table = table
+        self.id_column = id_column
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.bloom = None
+        self.lock = threading.Lock()
+        self.skipped = 0
+
+    def _warm(self):
+        """최근 저장된 hash_key 로 필터 채우기 (용량의 절반까지만 → 이후 추가분 여유)"""
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        with transaction(self.db_params) as cur:
+            cur.execute(
+                f"SELECT hash_key FROM public.{self.table} ORDER BY {self.id_column} DESC LIMIT %s",
+                (self.capacity // 2,)
+            )
+            for (hash_key,) in cur.fetchall():
+                bloom.add(hash_key)
+        self.bloom = bloom
+        print(f"🧮 [{self.table}] 중복 필터 준비: 최근 hash_key {bloom.count}개")
+
+    def _ensure(self):
+        if self.bloom is None or self.bloom.count >= self.capacity:
+            try:
+                self._warm()
+            except Exception as e:
+                # 필터 없이도 ON CONFLICT 로 중복은 걸러지므로 빈 필터로 계속
+                print(f"⚠️ [{self.table}] 중복 필터 준비 실패 (빈 필터로 시작): {e}")
+                self.bloom = BloomFilter(self.capacity, self.error_rate)
+
+    def unseen(self, items: Iterable, key: Callable = lambda item: item) -> List:
+        """아마도 새로운 것만 (필터에 있는 키 = 이미 저장된 것으로 보고 제외)"""
+        items = list(items)
+        with self.lock:
+            self._ensure()
+            fresh = [item for item in items if key(item) not in self.bloom]
+            self.skipped += len(items) - len(fresh)
+        return fresh
+
+    def add(self, keys: Iterable[str]):
+        with self.lock:
+            self._ensure()
+            for k in keys:
+                self.bloom.add(k)
+
+
+# 프로세스 안에서 같은 테이블을 보는 수집기끼리 공유
+_filters: Dict[tuple, SeenFilter] = {}
+_filters_lock = threading.Lock()
+
+
+def get_seen_filter(db_params: Dict, table: str, id_column: str) -> SeenFilter:
+    key = (tuple(sorted(db_params.items())), table)
+    with _filters_lock:
+        seen = _filters.get(key)
+        if seen is None:
+            seen = _filters[key] = SeenFilter(db_params, table, id_column)
+        return seen
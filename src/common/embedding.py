@@ -0,0 +1,58 @@
+"""
+새 문서 임베딩 + Qdrant 저장 (수집 사이클 단위 배치)
+
+- 문서마다 encode / upsert 하던 것을 사이클 끝에 한 번에:
+  UPSERT_CHUNK 개 단위로 encode(list, batch_size) → upsert
+- docs: [(point_id, text, payload), ...]  (point_id = news_id / community_id)
+- 성공한 청크만 대기열에서 빠지고, 실패하면 나머지는 그대로 남아 다음 사이클에 재시도
+  (trim_pending() 으로 대기열 상한 유지)
+"""
+from typing import Dict, List, Tuple
+
+from qdrant_client.models import PointStruct
+
+EMBED_BATCH_SIZE = 64
+UPSERT_CHUNK = 512
+# Qdrant 장애가 길어져도 대기열은 최근 MAX_PENDING 건까지만 (나머지는 DB 에서 재임베딩)
+MAX_PENDING = 5000
+
+
+def _upsert_chunk(model, client, collection_name: str, docs, batch_size: int):
+    vectors = model.encode(
+        [f"passage: {text}" for _, text, _ in docs],
+        batch_size=batch_size,
+        convert_to_numpy=True
+    )
+    points = [
+        PointStruct(id=point_id, vector=vector.tolist(), payload=payload)
+        for (point_id, _, payload), vector in zip(docs, vectors)
+    ]
+    client.upsert(collection_name=collection_name, points=points)
+
+
+def embed_pending(
+    model,
+    client,
+    collection_name: str,
+    pending: List[Tuple[int, str, Dict]],
+    batch_size: int = EMBED_BATCH_SIZE
+) -> int:
+    """
+    대기열을 앞에서부터 UPSERT_CHUNK 개씩 저장하고, 저장된 청크는 pending 에서 제거
+    → 중간에 실패하면 예외를 그대로 올리고 pending 에는 아직 못 보낸 것만 남음
+    """
+    done = 0
+    while pending:
+        chunk = pending[:UPSERT_CHUNK]
+        _upsert_chunk(model, client, collection_name, chunk, batch_size)
+        del pending[:len(chunk)]
+        done += len(chunk)
+    return done
+
+
+def trim_pending(pending: List, limit: int = MAX_PENDING) -> int:
+    """대기열을 최근 limit 건만 남기고 잘라냄 → 버린 건수"""
+    dropped = max(len(pending) - limit, 0)
+    if dropped:
+        del pending[:dropped]
+    return dropped
@@ -0,0 +1,91 @@
+"""
+RSS 피드 동시 다운로드 + 파싱
+
+- aiohttp 세션 하나로 모든 피드를 동시에 요청 (호스트별 keep-alive 커넥션 재사용)
+- 동시 요청 수 / 호스트당 동시 요청 수는 semaphore 로 제한
+- 피드마다 개별 타임아웃 (자리를 얻은 뒤부터 계산) → 느린 피드 하나가 사이클 전체를 붙잡지 않음
+- 피드 하나의 어떤 에러도 FeedResult.error 로만 남음 → 다른 피드 결과는 그대로
+- 다운로드가 끝난 피드부터 스레드 풀에서 feedparser 파싱 (남은 다운로드와 겹쳐서 진행)
+→ 사이클 시간 ≈ 가장 느린 피드 하나 (피드 지연시간의 합 X)
+
+    results = fetch_feeds([("BTC", url, None), ("Decrypt", url2, None)])
+    for r in results:          # 입력 순서 그대로
+        r.entries              # 실패 / 200 이 아니면 []
+"""
+import asyncio
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+import feedparser
+
+FETCH_CONCURRENCY = 10
+FETCH_PER_HOST = 4
+FEED_TIMEOUT = 15  # seconds
+PARSE_WORKERS = 4
+USER_AGENT = 'Mozilla/5.0'
+
+
+class FeedResult:
+    def __init__(self, key: str, url: str):
+        self.key = key
+        self.url = url
+        self.status: Optional[int] = None
+        self.headers: Dict[str, str] = {}
+        self.feed = None
+        self.error: Optional[Exception] = None
+        self.elapsed = 0.0
+
+    @property
+    def entries(self) -> list:
+        return self.feed.entries if self.feed is not None else []
+
+
+async def _fetch_one(session, sem, host_sems, executor, key, url, headers, timeout) -> FeedResult:
+    result = FeedResult(key, url)
+    started = time.monotonic()
+    try:
+        # aiohttp 의 limit_per_host 대기는 타임아웃에 포함되므로 직접 semaphore 로 줄 세움
+        async with host_sems[urlparse(url).netloc], sem:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                result.status = resp.status
+                result.headers = dict(resp.headers)
+                body = await resp.read()
+
+        if result.status == 200:
+            parse = partial(feedparser.parse, body, response_headers=result.headers)
+            result.feed = await asyncio.get_running_loop().run_in_executor(executor, parse)
+    except Exception as e:
+        # 네트워크 / 타임아웃 / 잘못된 URL / 파싱 에러 모두 이 피드만 실패 처리 (나머지 피드는 계속)
+        result.error = e
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+async def _fetch_all(feeds, concurrency, timeout, parse_workers) -> List[FeedResult]:
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    sem = asyncio.Semaphore(concurrency)
+    host_sems = defaultdict(lambda: asyncio.Semaphore(FETCH_PER_HOST))
+
+    with ThreadPoolExecutor(parse_workers, thread_name_prefix="feed-parse") as executor:
+        async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+            return await asyncio.gather(*(
+                _fetch_one(session, sem, host_sems, executor, key, url, headers, timeout)
+                for key, url, headers in feeds
+            ))
+
+
+def fetch_feeds(
+    feeds: Sequence[Tuple[str, str, Optional[Dict[str, str]]]],
+    concurrency: int = FETCH_CONCURRENCY,
+    timeout: float = FEED_TIMEOUT,
+    parse_workers: int = PARSE_WORKERS
+) -> List[FeedResult]:
+    """feeds: [(key, url, 추가 헤더 or None)] → 입력 순서대로 FeedResult"""
+    if not feeds:
+        return []
+    return asyncio.run(_fetch_all(feeds, concurrency, timeout, parse_workers))
@@ -0,0 +1,82 @@
+"""
+피드 URL 별 상태 저장소 (조건부 GET + 이미 본 글 ID)
+
+- ETag / Last-Modified 를 기억했다가 If-None-Match / If-Modified-Since 로 요청
+  → 304 면 파싱 / 해시 / DB 작업 전부 생략
+- 200 이어도 지난번에 처리한 글(entry id)은 건너뜀 (ETag 를 안 주는 피드 대비)
+- commit() 은 DB 저장이 성공한 뒤에만 → 저장 실패한 글은 다음 사이클에 다시 받음
+- JSON 파일로 유지 (수집기 프로세스마다 파일을 따로 써서 서로 덮어쓰지 않음)
+
+    state = FeedStateStore("feed_state_news.json")
+    headers = state.request_headers(url)
+    ...
+    fresh = state.fresh(url, feed.entries)
+    (fresh 저장 성공 시) state.commit(url, response_headers, feed.entries)
+    state.save()
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterable, List
+
+# URL 당 기억할 entry id 수 (피드 한 페이지보다 넉넉하게)
+MAX_SEEN_IDS = 500
+
+
+def entry_id(entry) -> str:
+    return entry.get('id') or entry.get('link') or entry.get('title', '')
+
+
+class FeedStateStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state: Dict[str, Dict] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 피드 상태 파일 로드 실패 (처음부터 수집): {e}")
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        with self.lock:
+            feed = self.state.get(url, {})
+        headers = {}
+        if feed.get('etag'):
+            headers['If-None-Match'] = feed['etag']
+        if feed.get('last_modified'):
+            headers['If-Modified-Since'] = feed['last_modified']
+        return headers
+
+    def fresh(self, url: str, entries: Iterable) -> List:
+        """지난번에 처리하지 않은 entry 만"""
+        with self.lock:
+            seen = set(self.state.get(url, {}).get('seen', []))
+        return [e for e in entries if entry_id(e) not in seen]
+
+    def commit(self, url: str, headers: Dict[str, str], entries: Iterable):
+        """처리 완료 → 응답의 검증자(ETag / Last-Modified)와 entry id 기록"""
+        # aiohttp / requests 응답 헤더 모두 대소문자 구분 없이 읽도록
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        with self.lock:
+            feed = self.state.setdefault(url, {})
+            feed['etag'] = headers.get('etag')
+            feed['last_modified'] = headers.get('last-modified')
+
+            ids = [entry_id(e) for e in entries]
+            new_ids = set(ids)
+            seen = [i for i in feed.get('seen', []) if i not in new_ids] + ids
+            feed['seen'] = seen[-MAX_SEEN_IDS:]
+
+    def save(self):
+        with self.lock:
+            data = json.dumps(self.state, ensure_ascii=False)
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ 피드 상태 저장 실패: {e}")
@@ -0,0 +1,78 @@
+"""
+스레드 공용 토큰 버킷 (요청 속도 제한)
+
+- 요청마다 sleep 하던 것을, 여러 워커가 버킷 하나에서 토큰을 받아가도록 변경
+  → 처리량은 정해진 속도(rate)로만 제한되고, 대기는 토큰이 모자랄 때만
+- jitter: 토큰을 받은 뒤 0~jitter 초 추가 대기 (요청이 같은 박자로 몰리지 않도록)
+- pause(seconds): 429 Retry-After / X-Ratelimit-Reset 을 받으면 모든 워커가 그때까지 쉼
+
+    limiter = TokenBucket(rate=20 / 60, burst=4, jitter=1.0)   # 분당 20회
+    limiter.acquire()            # 토큰이 생길 때까지 대기
+    ...
+    limiter.pause(retry_after)   # 서버가 쉬라고 하면
+"""
+import email.utils
+import random
+import threading
+import time
+from typing import Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 → 대기 초 (초 단위 숫자 / HTTP-date 둘 다 지원, 해석 불가면 None)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        """
+        :param rate: 초당 토큰 수
+        :param burst: 한 번에 쌓일 수 있는 최대 토큰 (연속 요청 허용량)
+        :param jitter: 토큰을 받은 뒤 추가로 쉬는 최대 초
+        """
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+
+    def pause(self, seconds: float):
+        """모든 워커를 seconds 동안 멈춤 (쉬는 동안 쌓인 토큰은 버림 → 재개 직후 몰리지 않도록)"""
+        with self.lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.updated = self.paused_until
@@ -0,0 +1,16 @@
+-- public.category 변경 알림 트리거 (CategoryRegistry 캐시 무효화용)
+-- 배포 시 한 번만 적용 (DDL 권한 필요):
+--     psql -h localhost -p 15432 -U postgres -d app -f src/common/sql/category_changed_trigger.sql
+-- 채널 이름은 common/category_registry.py 의 NOTIFY_CHANNEL 과 같아야 함
+
+CREATE OR REPLACE FUNCTION notify_category_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('category_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS category_changed ON public.category;
+CREATE TRIGGER category_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.category
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_category_changed();
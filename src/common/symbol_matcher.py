@@ -0,0 +1,60 @@
+"""
+기사 제목/본문 → 카테고리 매칭 (정규식 하나로 한 번에)
+
+- 카테고리마다 re.search 를 돌리던 것을, 전체 심볼(+이름)을 합친 정규식 하나로 대체
+  → 기사당 한 번 훑어서 걸린 카테고리를 모두 돌려줌
+- 단어 경계(\\b) 기준이라 'ETH' 가 'TOGETHER' 에 걸리지 않음
+- 같은 위치에서 시작하는 후보는 긴 것 우선 (예: 'BITCOIN CASH' 는 BITCOIN 이 아니라 BCH)
+- 카테고리 구성이 바뀔 때만 다시 컴파일 (get_matcher 가 구성별로 캐시)
+
+    matcher = get_matcher(categories)
+    matcher.match(title.upper(), also=av_tickers)   # → [category, ...] (categories 순서)
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+class SymbolMatcher:
+    def __init__(self, categories: List[Dict], use_names: bool = True):
+        self.categories = categories
+        self.order = {c['symbol']: i for i, c in enumerate(categories)}
+
+        # 검색어 → 심볼 (심볼이 이름보다 우선)
+        self.terms: Dict[str, str] = {}
+        if use_names:
+            for c in categories:
+                if c.get('name'):
+                    self.terms[c['name']] = c['symbol']
+        for c in categories:
+            self.terms[c['symbol']] = c['symbol']
+
+        alternation = "|".join(re.escape(t) for t in sorted(self.terms, key=len, reverse=True))
+        # lookahead 로 감싸서 겹치는 후보도 시작 위치마다 하나씩 잡음
+        self.pattern = re.compile(rf"(?=\b({alternation})\b)") if self.terms else None
+
+    def match(self, text: str, also: Iterable[str] = ()) -> List[Dict]:
+        """
+        :param text: 대문자로 맞춘 검색 대상
+        :param also: 기사 자체에 달린 심볼 목록 (AlphaVantage ticker, CryptoPanic currencies 등)
+        """
+        hits = {s for s in also if s in self.order}
+        if self.pattern is not None:
+            hits.update(self.terms[m.group(1)] for m in self.pattern.finditer(text))
+        return [self.categories[i] for i in sorted(self.order[s] for s in hits)]
+
+
+_matchers: Dict[tuple, SymbolMatcher] = {}
+_matchers_lock = threading.Lock()
+MAX_CACHED = 8
+
+
+def get_matcher(categories: List[Dict], use_names: bool = True) -> SymbolMatcher:
+    key = (use_names, tuple((c['symbol'], c.get('name'), c['id']) for c in categories))
+    with _matchers_lock:
+        matcher: Optional[SymbolMatcher] = _matchers.get(key)
+        if matcher is None:
+            if len(_matchers) >= MAX_CACHED:
+                _matchers.clear()
+            matcher = _matchers[key] = SymbolMatcher(categories, use_names)
+        return matcher